@@ -1,29 +1,30 @@
-class CellAction:
+from typing import NamedTuple
+
+
+class CellAction(NamedTuple):
     """
     Represents an action a cell wants to perform.
     
     Actions are created by cells during their decision-making phase
-    and executed by the world in a controlled manner.
+    and executed by the world in a controlled manner. They are plain
+    tuples, so creating and unpacking one every tick is cheap.
+
+    Attributes:
+        type (int): Type of action (ABSORB, RELEASE, MOVE).
+        molecule (int): Molecule id, for ABSORB and RELEASE.
+        amount (float): Amount of molecule, for ABSORB and RELEASE.
+        dx (int): Horizontal step, for MOVE.
+        dy (int): Vertical step, for MOVE.
+        cost (float): Energy cost paid when a MOVE is executed.
     """
-    
+    type: int
+    molecule: int = 0
+    amount: float = 0.0
+    dx: int = 0
+    dy: int = 0
+    cost: float = 0.0
+
     # Action types
-    ABSORB = "absorb"
-    RELEASE = "release"
-    MOVE = "move"
-    
-    def __init__(self, action_type, **kwargs):
-        """
-        Initializes a cell action.
-        
-        Args:
-            action_type (str): Type of action (ABSORB, RELEASE, MOVE).
-            **kwargs: Action-specific parameters:
-                - For ABSORB: molecule (str), amount (float)
-                - For RELEASE: molecule (str), amount (float)
-                - For MOVE: direction (tuple): (dx, dy)
-        """
-        self.type = action_type
-        self.params = kwargs
-    
-    def __repr__(self):
-        return f"CellAction({self.type}, {self.params})"
+    ABSORB = 0
+    RELEASE = 1
+    MOVE = 2
@@ -1,65 +1,165 @@
+import numpy as np
+
+from . import chemistry_dict as chem
 from .action import CellAction
+from .cell_pool import CellPool
+from .gen import next_rands
+from .kernels import metabolize_kernel
+
+# Neighbor directions checked for chemotaxis, and the unit steps a wandering
+# cell picks from (5% chance per tick)
+DIRECTIONS = (('N', (0, -1)), ('S', (0, 1)), ('E', (1, 0)), ('W', (-1, 0)))
+DIR_VECS = tuple(vec for _, vec in DIRECTIONS)
+WANDER_PROB = 0.05
+
+
+class _PoolField:
+    """Descriptor exposing one column of the cell's CellPool row as an attribute."""
+    def __init__(self, column, cast):
+        self.column = column
+        self.cast = cast
+
+    def __get__(self, cell, owner=None):
+        if cell is None:
+            return self
+        return self.cast(getattr(cell._pool, self.column)[cell._row])
+
+    def __set__(self, cell, value):
+        getattr(cell._pool, self.column)[cell._row] = value
+
 
 class Cell:
-    def __init__(self, genoma):
+    """
+    A living cell. Numeric state and grid position are stored in a row of a CellPool.
+
+    Attributes such as `energy`, `x` or `alive` read and write that row, so
+    the World can run the internal processes of all cells at once through the
+    pool while the object API keeps working for individual cells.
+    """
+    __slots__ = ("genoma", "_pool", "_row")
+
+    energy = _PoolField("energy", float)
+    age = _PoolField("age", int)
+    alive = _PoolField("alive", bool)
+    ready_to_divide = _PoolField("ready", bool)
+    division_cooldown = _PoolField("cooldown", int)
+    x = _PoolField("x", int)
+    y = _PoolField("y", int)
+
+    def __init__(self, genoma, pool=None):
+        """
+        Initializes a new cell.
+
+        Args:
+            genoma (Genoma): The cell's genome.
+            pool (CellPool, optional): Pool to allocate the cell's row in.
+                A private single-row pool is created if omitted.
+        """
         self.genoma = genoma
-        self.chemistry = {}
-        self.energy = 20 
-        self.age = 0
-        self.alive=True
-        self.ready_to_divide = False
-        self.division_cooldown = 0
-        self.x = None   
-        self.y = None
-        
-    
+        self._pool = pool if pool is not None else CellPool(capacity=1)
+        self._row = self._pool.add(tolerance=genoma.tolerance_vec, genes=genoma.gene_table,
+                                   needed=genoma.processable_mask, waste=genoma.waste_mask)
+
+    @property
+    def chemistry(self):
+        """np.ndarray: Internal chemistry, a float32 vector indexed by molecule id."""
+        return self._pool.chem[self._row]
+
+    @chemistry.setter
+    def chemistry(self, values):
+        self._pool.chem[self._row] = values
+
+    def _attach(self, pool):
+        """Moves the cell's state into another pool (e.g. the World's)."""
+        if pool is self._pool:
+            return
+        self._row = pool.copy_row_from(self._pool, self._row)
+        self._pool = pool
+
+
     def step(self):
         """
         Internal cell processes: energy dissipation, toxicity assessment, aging.
         Metabolism is now handled through decide_actions().
         """
-        self.ready_to_divide = False
-        if not self.alive:
-            return
-        self.dissipate()
-        self.assess_state()
-        self.age += 1
-     
-        
+        self._pool.step([self._row])
+
     def dissipate(self):
         """Energy dissipation due to maintenance costs."""
-        self.energy -= 0.1 + 0.0005*self.age
+        self._pool.dissipate([self._row])
 
     def observe_environment(self, env_chemistry):
         """
         Observes the local environment.
         
         Args:
-            env_chemistry (dict): Chemistry available at cell's current position.
+            env_chemistry (np.ndarray): Chemistry available at cell's current position, indexed by molecule id.
             
         Returns:
-            dict: The environment chemistry (pass-through for now, could add perception filters).
+            np.ndarray: The environment chemistry (pass-through for now, could add perception filters).
         """
         return env_chemistry
     
-    def decide_actions(self, env_chemistry, neighbors_chemistry):
+    def decide_actions(self, env_chemistry, neighbors_chemistry, rng=None):
         """
         Core decision-making logic. Cell analyzes its genome, internal state,
         and environment to decide what actions to take.
         
         Args:
-            env_chemistry (dict): Chemistry at cell's current position.
-            neighbors_chemistry (dict): Chemistry at neighboring positions (N, S, E, W).
+            env_chemistry (np.ndarray): Chemistry at cell's current position, indexed by molecule id.
+            neighbors_chemistry (np.ndarray): Chemistry at neighboring positions, one row
+                per direction in DIRECTIONS order (see World.get_neighbors_chemistry).
+            rng (np.random.Generator, optional): Source of the metabolism and wander
+                draws, e.g. World.rng, for reproducible runs. Defaults to the
+                shared draw buffer of biology.gen.
             
         Returns:
             list[CellAction]: List of actions the cell wants to perform.
         """
+        # Needed molecules are used by both the exchange and movement decisions
+        needed = self.genoma.needed
+        
+        # 1-2. Decide what to absorb and release
+        actions = self.decide_exchange(env_chemistry, needed)
+        
+        # Same draws, in the same order, as World.step: metabolism, then wander
+        rand = wander = None
+        if rng is not None:
+            rand = rng.random(len(self.genoma.genes))
+            wander = (rng.random(), int(rng.integers(0, len(DIR_VECS))))
+
+        # 3. Metabolize (internal decision, executed immediately)
+        self._metabolize(rand)
+        
+        # 4. Decide movement
+        movement = self._decide_movement(env_chemistry, neighbors_chemistry, needed, wander)
+        if movement:
+            actions.append(movement)
+        
+        return actions
+    
+    def decide_exchange(self, env_chemistry, needed=None):
+        """
+        Decides which molecules to absorb from and release to the environment.
+        
+        This is the part of decide_actions() that runs before metabolism; the
+        World calls it directly so it can metabolize all cells in one batch.
+        
+        Args:
+            env_chemistry (np.ndarray): Chemistry at cell's current position, indexed by molecule id.
+            needed (tuple[int], optional): Molecule ids needed by the genome, if
+                already computed by the caller.
+            
+        Returns:
+            list[CellAction]: ABSORB and RELEASE actions.
+        """
         actions = []
         
         # 1. Decide what to absorb based on genome needs
-        needed_mols = self._identify_needs()
-        for mol in needed_mols:
-            if mol in env_chemistry and env_chemistry[mol] > 0:
+        if needed is None:
+            needed = self.genoma.needed
+        for mol in needed:
+            if env_chemistry[mol] > 0:
                 # Absorb up to 50% of available, limited by energy cost
                 available = env_chemistry[mol]
                 desired = available * 0.5
@@ -67,42 +167,27 @@ class Cell:
                 # Energy cost: 0.01 per unit
                 cost = desired * 0.01
                 if self.energy > cost:
-                    actions.append(CellAction(CellAction.ABSORB, molecule=mol, amount=desired))
+                    actions.append(CellAction(CellAction.ABSORB, mol, desired))
         
         # 2. Decide what to release (toxins, waste)
         tolerances = self._calculate_tolerances()
-        waste_molecules = self._identify_waste()
+        waste_mask = self.genoma.waste_mask
+        chemistry = self.chemistry
         
-        for mol, amount in self.chemistry.items():
-            limit = tolerances.get(mol, 10.0)
-            is_waste = mol in waste_molecules
-            
-            # Release if:
-            # - It's metabolic waste (produced but not consumed)
-            # - It exceeds tolerance (toxic buildup)
-            if is_waste or amount > limit:
-                # Release all waste, or excess above 80% of tolerance
-                release_amt = amount if is_waste else (amount - limit * 0.8)
-                if release_amt > 0:
-                    actions.append(CellAction(CellAction.RELEASE, molecule=mol, amount=release_amt))
-        
-        # 3. Metabolize (internal decision, executed immediately)
-        self._metabolize()
-        
-        # 4. Decide movement
-        movement = self._decide_movement(env_chemistry, neighbors_chemistry)
-        if movement:
-            actions.append(movement)
+        # Release if:
+        # - It's metabolic waste (produced but not consumed)
+        # - It exceeds tolerance (toxic buildup)
+        # Release all waste, or excess above 80% of tolerance
+        release_amt = np.where(waste_mask, chemistry, chemistry - 0.8 * tolerances)
+        release_mask = (waste_mask | (chemistry > tolerances)) & (release_amt > 0)
+        for mol in np.flatnonzero(release_mask).tolist():
+            actions.append(CellAction(CellAction.RELEASE, mol, float(release_amt[mol])))
         
         return actions
     
     def _identify_needs(self):
-        """Identifies molecules needed by the cell's genes."""
-        needed_mols = set()
-        for gene in self.genoma.genes:
-            for input_mol in gene.input.keys():
-                needed_mols.add(input_mol)
-        return needed_mols
+        """Identifies molecules needed by the cell's genes (array of molecule ids)."""
+        return self.genoma.needed_ids
     
     def _identify_waste(self):
         """
@@ -112,55 +197,67 @@ class Cell:
         This makes waste an emergent property of the genome, not hardcoded.
         
         Returns:
-            set: Set of molecule names that are metabolic waste.
+            np.ndarray: Ids of the molecules that are metabolic waste.
         """
-        produced = set()
-        consumed = set()
-        
-        for gene in self.genoma.genes:
-            # Collect all outputs (produced)
-            produced.update(gene.output.keys())
-            # Collect all inputs (consumed)
-            consumed.update(gene.input.keys())
-        
-        # Waste = produced but not consumed
-        waste = produced - consumed
-        return waste
+        return self.genoma.waste_ids
     
     def _calculate_tolerances(self):
-        """Calculates toxicity tolerances based on genome."""
-        tolerances = {}
-        for gen in self.genoma.genes:
-            for mol, level in gen.tolerance.items():
-                tolerances[mol] = max(tolerances.get(mol, 0), level)
-        return tolerances
+        """Returns toxicity tolerances based on genome (float32 vector indexed by molecule id)."""
+        return self.genoma.tolerance_vec
     
-    def _metabolize(self):
+    def _metabolize(self, rand=None):
         """
         Internal metabolism: runs genetic reactions.
         This is now part of the decision phase, not forced by the world.
+
+        Args:
+            rand (np.ndarray, optional): One uniform draw per gene gating its success
+                probability. Taken from the shared draw buffer if omitted.
         """
-        for gen in self.genoma.genes:
-            if gen.can_react(self.chemistry, self.energy):
-                self.energy = gen.reaction(self.chemistry, self.energy)
+        genoma = self.genoma
+        chemistry = self.chemistry
+        energy = self.energy
+        if rand is None:
+            rand = next_rands(len(genoma.genes))
+
+        if metabolize_kernel is not None:
+            self.energy = metabolize_kernel(chemistry, energy, *genoma.gene_table, rand)
+            return
+
+        # A gene that needs a positive amount of an input that is absent and
+        # not produced by any gene cannot fire this tick
+        missing = chem.mask_to_bits(chemistry <= 0) & genoma.needed_bits & ~genoma.produced_bits
+
+        for gen, rand_u in zip(genoma.genes, rand.tolist()):
+            if gen.required_bits & missing:
+                continue
+            if gen.can_react(chemistry, energy):
+                energy = gen.reaction(chemistry, energy, rand_u)
+        self.energy = energy
     
-    def _decide_movement(self, env_chemistry, neighbors_chemistry):
+    def _decide_movement(self, env_chemistry, neighbors_chemistry, needed=None, wander=None):
         """
         Decides whether to move based on chemotaxis.
         
         Args:
-            env_chemistry (dict): Current position chemistry.
-            neighbors_chemistry (dict): Dict with keys 'N', 'S', 'E', 'W'.
+            env_chemistry (np.ndarray): Current position chemistry, indexed by molecule id.
+            neighbors_chemistry (np.ndarray): One chemistry row per direction, in
+                DIRECTIONS order (zero out of bounds).
+            needed (tuple[int], optional): Molecule ids needed by the genome, if
+                already computed by the caller.
+            wander (tuple, optional): Pre-drawn (uniform draw, direction index)
+                pair for the passive movement, so callers can draw them for many
+                cells at once. Taken from the shared draw buffer if omitted.
             
         Returns:
             CellAction or None: Movement action if beneficial.
         """
-        needed_mols = self._identify_needs()
+        needed_mols = self.genoma.needed if needed is None else needed
         if not needed_mols:
             return None
         
         # Calculate utility at current position
-        current_utility = sum(env_chemistry.get(mol, 0) for mol in needed_mols)
+        current_utility = sum(env_chemistry[mol] for mol in needed_mols)
         
         # Don't move if well-fed (save energy)
         if current_utility > 0.5:
@@ -170,34 +267,23 @@ class Cell:
         if self.energy < 0.5:  # Not enough energy to move
             return None
         
-        # Find best neighbor
-        directions = {
-            'N': (0, -1),
-            'S': (0, 1),
-            'E': (1, 0),
-            'W': (-1, 0)
-        }
-        
-        best_utility = current_utility * 1.05  # Require 5% improvement
-        best_direction = None
-        
-        for dir_name, (dx, dy) in directions.items():
-            if dir_name in neighbors_chemistry:
-                neighbor_chem = neighbors_chemistry[dir_name]
-                utility = sum(neighbor_chem.get(mol, 0) for mol in needed_mols)
-                
-                if utility > best_utility:
-                    best_utility = utility
-                    best_direction = (dx, dy)
+        # Find best neighbor: utilities of the 4 directions at once, accumulated
+        # molecule by molecule in the same order as the current utility
+        utilities = np.zeros(len(DIR_VECS), dtype=neighbors_chemistry.dtype)
+        for mol in needed_mols:
+            utilities += neighbors_chemistry[:, mol]
         
-        if best_direction:
-            return CellAction(CellAction.MOVE, direction=best_direction, cost=0.5)
+        # argmax keeps the first of equal neighbors, in DIRECTIONS order
+        best = int(utilities.argmax())
+        if utilities[best] > current_utility * 1.05:  # Require 5% improvement
+            return CellAction(CellAction.MOVE, 0, 0.0, *DIR_VECS[best], 0.5)
         
         # Passive random movement (5% chance)
-        import random
-        if random.random() < 0.05:
-            direction = random.choice(list(directions.values()))
-            return CellAction(CellAction.MOVE, direction=direction, cost=0)
+        if wander is None:
+            roll, pick = next_rands(2).tolist()
+            wander = (roll, int(pick * len(DIR_VECS)))
+        if wander[0] < WANDER_PROB:
+            return CellAction(CellAction.MOVE, 0, 0.0, *DIR_VECS[wander[1]])
         
         return None
     
@@ -206,7 +292,7 @@ class Cell:
         Absorbs a molecule from the environment (active transport).
         
         Args:
-            molecule (str): Molecule name.
+            molecule (int): Molecule id.
             amount (float): Amount to absorb.
             cost_per_unit (float): Energy cost per unit absorbed.
             
@@ -214,15 +300,16 @@ class Cell:
             float: Actual amount absorbed (may be less if insufficient energy).
         """
         cost = amount * cost_per_unit
+        energy = self.energy
         
         # Limit by available energy
-        if cost > self.energy:
-            amount = self.energy / cost_per_unit
-            cost = self.energy
+        if cost > energy:
+            amount = energy / cost_per_unit
+            cost = energy
         
         if amount > 0:
-            self.chemistry[molecule] = self.chemistry.get(molecule, 0) + amount
-            self.energy -= cost
+            self.chemistry[molecule] += amount
+            self.energy = energy - cost
         
         return amount
     
@@ -231,48 +318,25 @@ class Cell:
         Releases a molecule to the environment (passive diffusion).
         
         Args:
-            molecule (str): Molecule name.
+            molecule (int): Molecule id.
             amount (float): Amount to release.
             
         Returns:
             float: Actual amount released.
         """
-        available = self.chemistry.get(molecule, 0)
+        chemistry = self.chemistry
+        available = float(chemistry[molecule])
         actual = min(amount, available)
         
         if actual > 0:
-            self.chemistry[molecule] -= actual
-            if self.chemistry[molecule] <= 0:
-                del self.chemistry[molecule]
+            chemistry[molecule] = max(0.0, available - actual)
         
         return actual
     
     def assess_state(self):
         """Assesses cell state: toxicity damage, death, division readiness."""
-        # 1. Calculate Tolerances based on Genome
-        tolerances = self._calculate_tolerances()
-
-        # 2. Check internal chemistry for toxicity
-        for mol, amount in self.chemistry.items():
-            # Base tolerance is 10 for everything unless specified
-            limit = tolerances.get(mol, 10.0)
-            
-            if amount > limit:
-                # Damage proportional to excess
-                excess = amount - limit
-                self.energy -= 0.2 * excess
-            
-        if self.division_cooldown > 0:
-            self.division_cooldown -= 1
-            return
-
-        if self.energy < 0:
-            self.alive = False
-            return
-        # Division threshold: "2 pixels" worth of mass (10 per pixel approx)
-        if self.total_chemistry() >= 5 and self.energy > 5:
-            self.ready_to_divide = True
+        self._pool.assess_state([self._row])
 
     def total_chemistry(self):
         """Returns total biomass (sum of all internal molecules)."""
-        return sum(self.chemistry.values())
+        return float(self._pool.chem[self._row].sum())
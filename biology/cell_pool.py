@@ -0,0 +1,284 @@
+import numpy as np
+
+from .chemistry_dict import MAX_MOLECULES
+from .kernels import metabolize_pool_kernel, step_pool_kernel
+
+
+class CellPool:
+    """
+    Structure-of-Arrays storage for the numeric state of many cells.
+
+    Every cell owns one row of a set of parallel NumPy arrays, so the
+    per-tick internal processes (dissipation, toxicity, aging, division
+    readiness) run as a handful of vectorized operations over the whole
+    population instead of one Python call per cell. When Numba is
+    installed, whole-population metabolism and steps run as parallel
+    compiled kernels instead.
+
+    Attributes:
+        size (int): Number of rows currently in use.
+        energy (np.ndarray): float32 energy per cell.
+        age (np.ndarray): int32 age in steps.
+        alive (np.ndarray): bool alive flag.
+        cooldown (np.ndarray): int16 remaining division cooldown.
+        ready (np.ndarray): bool division readiness.
+        x, y (np.ndarray): int32 grid position of each cell.
+        chem (np.ndarray): float32 matrix (cells, MAX_MOLECULES) of internal chemistry.
+        tolerance (np.ndarray): float32 matrix (cells, MAX_MOLECULES) of toxicity limits.
+        needed (np.ndarray): bool matrix (cells, MAX_MOLECULES), molecules the genome consumes.
+        waste (np.ndarray): bool matrix (cells, MAX_MOLECULES), molecules the genome
+            produces but does not consume.
+        gene_* (np.ndarray): Each cell's gene table, padded to (cells, genes, width).
+            Missing genes have an infinite cost so they never react; missing
+            inputs/outputs have a zero amount.
+    """
+    DEFAULT_TOLERANCE = 10.0
+
+    _GENE_FIELDS = ("gene_in_ids", "gene_in_amt", "gene_out_ids", "gene_out_amt",
+                    "gene_cost", "gene_prob", "gene_yield")
+    _FIELDS = ("energy", "age", "alive", "cooldown", "ready", "x", "y", "chem", "tolerance",
+               "needed", "waste") + _GENE_FIELDS
+
+    def __init__(self, capacity=64):
+        """
+        Initializes an empty pool.
+
+        Args:
+            capacity (int): Number of rows to preallocate. The pool grows as needed.
+        """
+        self.size = 0
+        capacity = max(1, capacity)
+        self.energy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.cooldown = np.zeros(capacity, dtype=np.int16)
+        self.ready = np.zeros(capacity, dtype=bool)
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.chem = np.zeros((capacity, MAX_MOLECULES), dtype=np.float32)
+        self.tolerance = np.full((capacity, MAX_MOLECULES), self.DEFAULT_TOLERANCE, dtype=np.float32)
+        self.needed = np.zeros((capacity, MAX_MOLECULES), dtype=bool)
+        self.waste = np.zeros((capacity, MAX_MOLECULES), dtype=bool)
+
+        self.gene_in_ids = np.zeros((capacity, 1, 1), dtype=np.intp)
+        self.gene_in_amt = np.zeros((capacity, 1, 1), dtype=np.float32)
+        self.gene_out_ids = np.zeros((capacity, 1, 1), dtype=np.intp)
+        self.gene_out_amt = np.zeros((capacity, 1, 1), dtype=np.float32)
+        self.gene_cost = np.full((capacity, 1), np.inf, dtype=np.float32)
+        self.gene_prob = np.zeros((capacity, 1), dtype=np.float32)
+        self.gene_yield = np.zeros((capacity, 1), dtype=np.float32)
+
+    @property
+    def capacity(self):
+        return len(self.energy)
+
+    def _grow(self, min_capacity):
+        """Reallocates every array with at least `min_capacity` rows (amortized doubling)."""
+        new_capacity = max(min_capacity, 2 * self.capacity)
+        for name in self._FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+        self.tolerance[self.size:] = self.DEFAULT_TOLERANCE
+        self.gene_cost[self.size:] = np.inf
+
+    def _fit_genes(self, n_genes, width):
+        """Widens the gene table arrays to hold at least `n_genes` genes of `width` molecules."""
+        old_genes, old_width = self.gene_in_ids.shape[1:]
+        if n_genes <= old_genes and width <= old_width:
+            return
+        shape = (self.capacity, max(n_genes, old_genes), max(width, old_width))
+        for name in self._GENE_FIELDS:
+            old = getattr(self, name)
+            fill = np.inf if name == "gene_cost" else 0
+            new = np.full(shape[:old.ndim], fill, dtype=old.dtype)
+            new[tuple(slice(0, d) for d in old.shape)] = old
+            setattr(self, name, new)
+
+    def _set_row(self, name, row, value):
+        """Writes one row of a field, padding gene tables that are smaller than the pool's."""
+        column = getattr(self, name)
+        if name in self._GENE_FIELDS:
+            column[row] = np.inf if name == "gene_cost" else 0
+            column[(row,) + tuple(slice(0, d) for d in np.shape(value))] = value
+        else:
+            column[row] = value
+
+    def add(self, energy=20, tolerance=None, genes=None, needed=None, waste=None):
+        """
+        Appends a new living cell row.
+
+        Args:
+            energy (float): Initial energy.
+            tolerance (np.ndarray, optional): Toxicity limit per molecule id.
+            genes (tuple, optional): Gene table as built by Genoma._build_indexes.
+            needed (np.ndarray, optional): bool mask of the molecules the genome consumes.
+            waste (np.ndarray, optional): bool mask of the genome's waste molecules.
+
+        Returns:
+            int: Row index of the new cell.
+        """
+        if self.size >= self.capacity:
+            self._grow(self.size + 1)
+        row = self.size
+        self.size += 1
+
+        self.energy[row] = energy
+        self.age[row] = 0
+        self.alive[row] = True
+        self.cooldown[row] = 0
+        self.ready[row] = False
+        self.x[row] = 0
+        self.y[row] = 0
+        self.chem[row] = 0
+        self.tolerance[row] = self.DEFAULT_TOLERANCE if tolerance is None else tolerance
+        self.needed[row] = False if needed is None else needed
+        self.waste[row] = False if waste is None else waste
+
+        self.gene_cost[row] = np.inf
+        if genes is not None:
+            in_ids, in_amt, _, out_ids, out_amt, _, cost, prob, yld = genes
+            self._fit_genes(*in_ids.shape)
+            for name, value in zip(self._GENE_FIELDS, (in_ids, in_amt, out_ids, out_amt, cost, prob, yld)):
+                self._set_row(name, row, value)
+        return row
+
+    def copy_row_from(self, other, other_row):
+        """
+        Appends a copy of a row living in another pool.
+
+        Args:
+            other (CellPool): Source pool.
+            other_row (int): Row index in the source pool.
+
+        Returns:
+            int: Row index in this pool.
+        """
+        row = self.add()
+        self._fit_genes(*other.gene_in_ids.shape[1:])
+        for name in self._FIELDS:
+            self._set_row(name, row, getattr(other, name)[other_row])
+        return row
+
+    def compact(self, rows, start=0):
+        """
+        Keeps only the given rows, in the given order, packed at the front.
+
+        Args:
+            rows (sequence[int]): Row indices to keep. Row `rows[i]` becomes row `start + i`.
+            start (int): Number of leading rows that are kept in place untouched.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        n = start + len(rows)
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            arr[start:n] = arr[rows]
+        self.size = n
+
+    def _select(self, rows):
+        return slice(0, self.size) if rows is None else rows
+
+    def total_chemistry(self, rows=None):
+        """Returns total biomass (sum of all internal molecules) per cell."""
+        return self.chem[self._select(rows)].sum(axis=1)
+
+    def dissipate(self, rows=None):
+        """Energy dissipation due to maintenance costs."""
+        idx = self._select(rows)
+        # int32 ages would promote the whole expression to float64
+        self.energy[idx] -= 0.1 + 0.0005 * self.age[idx].astype(np.float32)
+
+    def assess_state(self, rows=None):
+        """Assesses cell state: toxicity damage, death, division readiness."""
+        idx = self._select(rows)
+
+        chem = self.chem[idx]
+        total = chem.sum(axis=1)
+
+        # 1. Toxicity: damage proportional to the excess over each tolerance,
+        # computed branchless in a single scratch buffer
+        excess = np.subtract(chem, self.tolerance[idx])
+        np.maximum(excess, 0, out=excess)
+        energy = self.energy[idx] - 0.2 * excess.sum(axis=1)
+        self.energy[idx] = energy
+
+        # 2. Cells in cooldown only tick their timer down
+        cooldown = self.cooldown[idx]
+        cooling = cooldown > 0
+        self.cooldown[idx] = np.where(cooling, cooldown - 1, cooldown)
+
+        # 3. Death
+        dead = ~cooling & (energy < 0)
+        self.alive[idx] = self.alive[idx] & ~dead
+
+        # 4. Division threshold: "2 pixels" worth of mass (10 per pixel approx)
+        self.ready[idx] = ~cooling & ~dead & (total >= 5) & (energy > 5)
+
+    def metabolize(self, rand=None):
+        """
+        Runs the genetic reactions of every living cell at once.
+
+        Genes are applied in genome order, one vectorized pass per gene position,
+        so each cell sees exactly the sequence of can_react / reaction checks that
+        Gen would perform on it individually.
+
+        Args:
+            rand (np.ndarray, optional): Uniform draws of shape (living cells, genes)
+                gating each gene's success probability. Drawn if omitted.
+        """
+        living = np.flatnonzero(self.alive[:self.size])
+        n_genes = self.gene_cost.shape[1]
+        if len(living) == 0:
+            return
+        if rand is None:
+            rand = np.random.random((len(living), n_genes))
+        if metabolize_pool_kernel is not None:
+            metabolize_pool_kernel(living, self.energy, self.chem, self.gene_in_ids, self.gene_in_amt,
+                                   self.gene_out_ids, self.gene_out_amt, self.gene_cost,
+                                   self.gene_prob, self.gene_yield, rand)
+            return
+
+        chem = self.chem
+        energy = self.energy
+        for g in range(n_genes):
+            cost = self.gene_cost[living, g]
+            inputs_ok = (chem[living[:, None], self.gene_in_ids[living, g]] >= self.gene_in_amt[living, g]).all(axis=1)
+            can_react = (energy[living] >= cost) & inputs_ok
+            if not can_react.any():
+                continue
+
+            # Every attempted reaction pays its cost
+            rows = living[can_react]
+            energy[rows] -= cost[can_react]
+
+            # Successful ones consume inputs, add outputs and yield energy
+            rows = rows[rand[can_react, g] <= self.gene_prob[rows, g]]
+            np.add.at(chem, (rows[:, None], self.gene_in_ids[rows, g]), -self.gene_in_amt[rows, g])
+            np.add.at(chem, (rows[:, None], self.gene_out_ids[rows, g]), self.gene_out_amt[rows, g])
+            energy[rows] += self.gene_yield[rows, g]
+
+    def step(self, rows=None):
+        """
+        Internal cell processes for living rows: energy dissipation, toxicity assessment, aging.
+
+        Args:
+            rows (array-like, optional): Row indices to step. Defaults to every row in use.
+        """
+        if rows is None and step_pool_kernel is not None:
+            step_pool_kernel(self.size, self.energy, self.age, self.alive, self.cooldown,
+                             self.ready, self.chem, self.tolerance)
+            return
+        idx = self._select(rows)
+        self.ready[idx] = False
+        living = np.flatnonzero(self.alive[idx])
+        if rows is not None:
+            living = np.asarray(rows, dtype=np.intp)[living]
+        if len(living) == 0:
+            return
+        if rows is None and len(living) == self.size:
+            # Whole population alive: slices are views, no gather copies
+            living = slice(0, self.size)
+        self.dissipate(living)
+        self.assess_state(living)
+        self.age[living] += 1
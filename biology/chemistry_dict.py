@@ -0,0 +1,97 @@
+"""
+Molecule registry.
+
+Maps molecule names (e.g. "A", "B", "C") to small integer ids so that
+chemistry can be stored in dense arrays instead of name-keyed dicts.
+Ids are assigned on first use and are bounded by MAX_MOLECULES so they
+always fit in a single byte.
+
+Sets of molecule ids can also be packed into a 256-bit integer (bit i set
+means id i is a member), so intersections are a single `&`.
+"""
+import numpy as np
+
+MAX_MOLECULES = 256
+
+NAME_TO_INT = {}
+# Indexed by id, so id -> name is a single list lookup
+INT_TO_NAME = [None] * MAX_MOLECULES
+
+
+def get_value(name):
+    """
+    Returns the integer id of a molecule, registering it if needed.
+
+    Args:
+        name (str): Molecule name.
+
+    Returns:
+        int: Molecule id in the range [0, MAX_MOLECULES).
+    """
+    value = NAME_TO_INT.get(name)
+    if value is None:
+        value = len(NAME_TO_INT)
+        if value >= MAX_MOLECULES:
+            raise ValueError(f"Molecule registry is full ({MAX_MOLECULES} molecules)")
+        NAME_TO_INT[name] = value
+        INT_TO_NAME[value] = name
+    return value
+
+
+def get_name(value):
+    """
+    Returns the name of a molecule id.
+
+    Args:
+        value (int): Molecule id.
+
+    Returns:
+        str: Registered name, or a placeholder for unknown ids.
+    """
+    name = INT_TO_NAME[value] if 0 <= value < MAX_MOLECULES else None
+    return name if name is not None else f"UNK_{value:02X}"
+
+
+def ids_to_bits(ids):
+    """
+    Packs molecule ids into a bitset.
+
+    Args:
+        ids (iterable[int]): Molecule ids.
+
+    Returns:
+        int: Bitset with bit `i` set for every id `i`.
+    """
+    bits = 0
+    for value in ids:
+        bits |= 1 << int(value)
+    return bits
+
+
+def mask_to_bits(mask):
+    """
+    Packs a bool vector indexed by molecule id into a bitset.
+
+    Args:
+        mask (np.ndarray): Bool vector of length MAX_MOLECULES.
+
+    Returns:
+        int: Bitset with bit `i` set where `mask[i]` is True.
+    """
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+def iter_bits(bits):
+    """
+    Yields the molecule ids in a bitset, lowest first.
+
+    Args:
+        bits (int): Bitset of molecule ids.
+
+    Yields:
+        int: Member ids.
+    """
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
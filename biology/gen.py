@@ -1,4 +1,90 @@
-import random
+import weakref
+from types import MappingProxyType
+
+import numpy as np
+
+from . import chemistry_dict as chem
+
+# Uniform draws are generated in bulk and handed out one by one, which is
+# much cheaper per draw than a separate RNG call for every reaction attempt.
+_RAND_BUFFER_SIZE = 65536
+_rand_buf = np.random.random(_RAND_BUFFER_SIZE)
+_rand_list = _rand_buf.tolist()
+_rand_idx = 0
+
+
+def _refill_rand_buffer():
+    global _rand_buf, _rand_list, _rand_idx
+    _rand_buf = np.random.random(_RAND_BUFFER_SIZE)
+    _rand_list = _rand_buf.tolist()
+    _rand_idx = 0
+
+
+def next_rand():
+    """Returns the next uniform draw in [0, 1) from the prefilled buffer."""
+    global _rand_idx
+    if _rand_idx >= _RAND_BUFFER_SIZE:
+        _refill_rand_buffer()
+    value = _rand_list[_rand_idx]
+    _rand_idx += 1
+    return value
+
+
+def next_rands(n):
+    """Returns the next `n` uniform draws from the prefilled buffer as an array."""
+    global _rand_idx
+    if _rand_idx + n > _RAND_BUFFER_SIZE:
+        _refill_rand_buffer()
+    values = _rand_buf[_rand_idx:_rand_idx + n]
+    _rand_idx += n
+    return values
+
+
+def _compile_reaction(input_ids, input_amts, output_ids, output_amts):
+    """
+    Generates straight-line functions for one gene's fixed reaction.
+
+    The molecule ids and amounts are known when the gene is built, so they are
+    emitted as constants instead of being looped over on every call.
+
+    Returns:
+        tuple: (has_inputs(chem) -> bool, apply(chem) -> None).
+    """
+    checks = [f"chem[{mol}] >= {amt!r}" for mol, amt in zip(input_ids.tolist(), input_amts.tolist())]
+    updates = [f"    chem[{mol}] -= {amt!r}" for mol, amt in zip(input_ids.tolist(), input_amts.tolist())]
+    updates += [f"    chem[{mol}] += {amt!r}" for mol, amt in zip(output_ids.tolist(), output_amts.tolist())]
+    check = " and ".join(checks) if checks else "True"
+    src = f"def has_inputs(chem):\n    return bool({check})\n"
+    src += "def apply(chem):\n" + ("\n".join(updates) if updates else "    pass") + "\n"
+    namespace = {}
+    exec(src, namespace)
+    return namespace["has_inputs"], namespace["apply"]
+
+
+# Flyweight pool: genomes share one Gen per distinct definition. Weak values let
+# genes that no living genome uses anymore be collected.
+_GEN_POOL = weakref.WeakValueDictionary()
+
+
+def gen_for(input, output, cost, prob, energy_yield=0, tolerance=None):
+    """
+    Returns the shared Gen with this definition, creating it if needed.
+
+    Takes the same arguments as Gen. Genes obtained here (or through
+    Gen.variant) may be shared by many genomes, so they must be replaced
+    rather than modified in place.
+
+    Returns:
+        Gen: The interned gene.
+    """
+    tolerance = tolerance if tolerance else {}
+    key = (tuple(sorted(input.items())), tuple(sorted(output.items())),
+           tuple(sorted(tolerance.items())), cost, prob, energy_yield)
+    gene = _GEN_POOL.get(key)
+    if gene is None:
+        gene = _GEN_POOL[key] = Gen(input, output, cost, prob, energy_yield, tolerance)
+    return gene
+
 
 class Gen:
     """
@@ -6,7 +92,16 @@ class Gen:
     
     A gene takes certain chemical inputs, consumes energy, and produces chemical outputs
     based on a certain probability. It also defines environmental tolerances for the cell.
+
+    Genomes share gene instances (flyweights, see gen_for and variant), so a
+    gene that belongs to a genome is replaced rather than modified when it mutates:
+    its definition is read-only once the gene is built. input, output and
+    tolerance are kept as read-only copies of the dicts passed in.
     """
+    __slots__ = ("_input", "_output", "_cost", "_prob", "_energy_yield", "_tolerance",
+                 "input_ids", "input_amts", "output_ids", "output_amts",
+                 "required_bits", "_has_inputs", "_apply", "_id", "_id_str", "_frozen", "__weakref__")
+
     def __init__(self, input, output, cost, prob, energy_yield=0, tolerance=None):
         """
         Initializes a new Gen instance.
@@ -20,6 +115,9 @@ class Gen:
             tolerance (dict, optional): A dictionary of environmental tolerances (e.g., temperature, pH).
                                        Defaults to an empty dictionary.
         """
+        self._frozen = False
+        self._id = None
+        self._id_str = None
         self.input = input
         self.output = output
         self.cost = cost
@@ -27,12 +125,142 @@ class Gen:
         self.energy_yield = energy_yield
         self.tolerance = tolerance if tolerance else {}
 
+        # Molecule ids and amounts as small arrays, so reactions index the
+        # cell's chemistry vector directly
+        self.input_ids, self.input_amts = self._to_arrays(self._input)
+        self.output_ids, self.output_amts = self._to_arrays(self._output)
+        # Inputs needed in a positive amount: the gene cannot react while any is absent
+        self.required_bits = chem.ids_to_bits(self.input_ids[self.input_amts > 0].tolist())
+        self._has_inputs, self._apply = _compile_reaction(self.input_ids, self.input_amts,
+                                                          self.output_ids, self.output_amts)
+        self._frozen = True
+
+    def __reduce__(self):
+        # Generated functions are not picklable; rebuild them from the definition
+        return (Gen, (dict(self._input), dict(self._output), self._cost, self._prob,
+                      self._energy_yield, dict(self._tolerance)))
+
+    def __deepcopy__(self, memo):
+        return self.clone()
+
+    def clone(self):
+        """
+        Returns an independent copy of the gene, much cheaper than copy.deepcopy.
+
+        The definition, id arrays and generated functions are never modified
+        in place, so copies share them.
+        """
+        clone = Gen.__new__(Gen)
+        for name in Gen.__slots__[:-1]:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    def _pool_key(self, cost, prob):
+        """Flyweight pool key of this gene's definition with the given cost and probability."""
+        inputs, outputs, _, _, tolerances = self.get_id()
+        return (inputs, outputs, tolerances, cost, prob, self.energy_yield)
+
+    def variant(self, cost=None, prob=None):
+        """
+        Returns the shared gene equal to this one with another cost and/or probability.
+
+        Used by mutations so genes shared between genomes are never modified in
+        place. A new gene is cloned from this one (reusing its generated reaction
+        functions) only when no gene with that definition exists yet.
+
+        Args:
+            cost (float, optional): New cost. Defaults to the current one.
+            prob (float, optional): New success probability. Defaults to the current one.
+
+        Returns:
+            Gen: The interned variant.
+        """
+        cost = self.cost if cost is None else cost
+        prob = self.prob if prob is None else prob
+        key = self._pool_key(cost, prob)
+        gene = _GEN_POOL.get(key)
+        if gene is None:
+            gene = self.clone()
+            gene._frozen = False
+            gene.cost = cost
+            gene.prob = prob
+            gene._frozen = True
+            _GEN_POOL[key] = gene
+        return gene
+
+    def _check_mutable(self, name):
+        """Rejects changing a built gene, which genomes and gene tables may share."""
+        if self._frozen:
+            raise AttributeError(f"Gen.{name} cannot be changed once the gene is built, use variant()")
+
+    @property
+    def input(self):
+        return self._input
+
+    @input.setter
+    def input(self, value):
+        self._check_mutable("input")
+        self._input = MappingProxyType(dict(value))
+
+    @property
+    def output(self):
+        return self._output
+
+    @output.setter
+    def output(self, value):
+        self._check_mutable("output")
+        self._output = MappingProxyType(dict(value))
+
+    @property
+    def tolerance(self):
+        return self._tolerance
+
+    @tolerance.setter
+    def tolerance(self, value):
+        self._check_mutable("tolerance")
+        self._tolerance = MappingProxyType(dict(value))
+
+    @property
+    def cost(self):
+        return self._cost
+
+    @cost.setter
+    def cost(self, value):
+        self._check_mutable("cost")
+        self._cost = value
+        self._id = self._id_str = None
+
+    @property
+    def prob(self):
+        return self._prob
+
+    @prob.setter
+    def prob(self, value):
+        self._check_mutable("prob")
+        self._prob = value
+
+    @property
+    def energy_yield(self):
+        return self._energy_yield
+
+    @energy_yield.setter
+    def energy_yield(self, value):
+        self._check_mutable("energy_yield")
+        self._energy_yield = value
+        self._id = self._id_str = None
+
+    @staticmethod
+    def _to_arrays(molecules):
+        ids = np.array([chem.get_value(mol) for mol in molecules], dtype=np.intp)
+        amounts = np.array(list(molecules.values()), dtype=np.float32)
+        return ids, amounts
+
     def can_react(self, chemistry, energy):
         """
         Checks if the reaction can be performed given the available chemistry and energy.
 
         Args:
-            chemistry (dict): The current chemical composition of the environment/cell.
+            chemistry (np.ndarray): The current chemical composition of the cell, indexed by molecule id.
             energy (float): The current energy available to the cell.
 
         Returns:
@@ -40,13 +268,9 @@ class Gen:
         """
         if energy < self.cost:
             return False
+        return self._has_inputs(chemistry)
 
-        for mol, cant in self.input.items():
-            if chemistry.get(mol,0) < cant:
-                return False
-        return True
-
-    def reaction(self, chemistry, energy):
+    def reaction(self, chemistry, energy, rand_u=None):
         """
         Executes the metabolic reaction defined by this gene.
 
@@ -54,35 +278,52 @@ class Gen:
         and outputs/energy yield are added. The energy cost is always subtracted.
 
         Args:
-            chemistry (dict): The chemical composition to modify.
+            chemistry (np.ndarray): The chemical composition to modify, indexed by molecule id.
             energy (float): The current energy of the cell.
+            rand_u (float, optional): Pre-drawn uniform draw in [0, 1) gating the
+                success probability. Taken from the shared draw buffer if omitted.
 
         Returns:
             float: The new energy level after the reaction attempt.
         """
-        if random.random() > self.prob:
-            return energy - self.cost
-        for mol, cant in self.input.items():
-            chemistry[mol] -= cant
-        for mol, cant in self.output.items():
-            chemistry[mol] = chemistry.get(mol, 0) + cant
-        return energy - self.cost + self.energy_yield
+        if (next_rand() if rand_u is None else rand_u) > self._prob:
+            return energy - self._cost
+        self._apply(chemistry)
+        return energy - self._cost + self._energy_yield
 
     def get_id(self):
         """
-        Returns a stable string representation of the gene's functional logic.
+        Returns a stable, hashable key of the gene's functional logic.
 
         This ID is used to compare genes and identify unique genetic traits.
-        The ID is deterministic by sorting inputs, outputs, and tolerances.
+        It is deterministic by sorting inputs, outputs, and tolerances, and is
+        computed once per gene (genes are immutable, variants get their own).
+
+        Returns:
+            tuple: A tuple uniquely identifying this gene's logic.
+        """
+        if self._id is None:
+            self._id = (tuple(sorted(self.input.items())),
+                        tuple(sorted(self.output.items())),
+                        round(self.cost, 4),
+                        round(self.energy_yield, 4),
+                        tuple(sorted(self.tolerance.items())))
+        return self._id
+
+    def get_id_str(self):
+        """
+        Returns a stable string representation of the gene's functional logic.
 
         Returns:
-            str: A string uniquely identifying this gene's logic.
+            str: A human readable string uniquely identifying this gene's logic.
         """
-        # Sort inputs and outputs to ensure deterministic string
-        inputs = sorted(self.input.items())
-        outputs = sorted(self.output.items())
-        tolerances = sorted(self.tolerance.items())
-        return f"in:{inputs}|out:{outputs}|cost:{self.cost:.4f}|yield:{self.energy_yield:.4f}|tol:{tolerances}"
+        if self._id_str is None:
+            # Sort inputs and outputs to ensure deterministic string
+            inputs = sorted(self.input.items())
+            outputs = sorted(self.output.items())
+            tolerances = sorted(self.tolerance.items())
+            self._id_str = f"in:{inputs}|out:{outputs}|cost:{self.cost:.4f}|yield:{self.energy_yield:.4f}|tol:{tolerances}"
+        return self._id_str
 
     def __repr__(self):
         """
@@ -1,48 +1,175 @@
-import random
+import hashlib
+
+import numpy as np
+
+from . import chemistry_dict as chem
+from .gen import next_rands
 
 class Genoma:
+    DEFAULT_TOLERANCE = 10.0
+
+    __slots__ = ("genes", "processable_mask", "needed_ids", "needed",
+                 "waste_mask", "waste_ids", "needed_bits", "produced_bits",
+                 "tolerance_vec", "gene_table", "display_color", "_hash")
+
     def __init__(self, genes):
         self.genes = genes  
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """
+        Precomputes the genome-derived lookups cells use every tick.
+
+        These only depend on the genes, so they are rebuilt when the genome
+        mutates, not on every query:
+        - needed_ids: ids of molecules consumed by any gene.
+        - needed: the same ids as a tuple of ints, for per-cell Python loops.
+        - processable_mask: bool vector, True for molecules some gene consumes.
+        - waste_mask: bool vector, True for molecules produced but not consumed.
+        - waste_ids: ids of the waste molecules.
+        - needed_bits, produced_bits: the same sets as bitsets
+          (see chemistry_dict.mask_to_bits).
+        - tolerance_vec: float32 vector of toxicity limits (max over genes,
+          DEFAULT_TOLERANCE where no gene specifies one).
+        - gene_table: the genes as padded parallel arrays
+          (in_ids, in_amt, in_len, out_ids, out_amt, out_len, cost, prob, yield),
+          the layout expected by kernels.metabolize_kernel.
+        - display_color: RGB color cached by the renderer, None until drawn.
+        """
+        # Mutations invalidate the cached get_hash() digest and display color
+        self._hash = None
+        self.display_color = None
+        processable = np.zeros(chem.MAX_MOLECULES, dtype=bool)
+        produced = np.zeros(chem.MAX_MOLECULES, dtype=bool)
+        tolerances = {}
+        for gene in self.genes:
+            processable[gene.input_ids] = True
+            produced[gene.output_ids] = True
+            for mol, level in gene.tolerance.items():
+                mol_id = chem.get_value(mol)
+                tolerances[mol_id] = max(tolerances.get(mol_id, 0), level)
+
+        self.processable_mask = processable
+        self.needed_ids = np.flatnonzero(processable)
+        self.needed = tuple(self.needed_ids.tolist())
+        self.waste_mask = produced & ~processable
+        self.waste_ids = np.flatnonzero(self.waste_mask)
+        self.needed_bits = chem.mask_to_bits(processable)
+        self.produced_bits = chem.mask_to_bits(produced)
+        self.tolerance_vec = np.full(chem.MAX_MOLECULES, self.DEFAULT_TOLERANCE, dtype=np.float32)
+        for mol_id, level in tolerances.items():
+            self.tolerance_vec[mol_id] = level
+        self.gene_table = self._build_gene_table()
+
+    def clone(self):
+        """
+        Returns an independent copy of the genome, much cheaper than copy.deepcopy.
+
+        Genes are flyweights shared between genomes, and the derived indexes
+        are shared too: neither is modified in place, mutate() replaces them.
+        Only the gene list itself is copied.
+        """
+        genoma = Genoma.__new__(Genoma)
+        for name in Genoma.__slots__:
+            setattr(genoma, name, getattr(self, name))
+        genoma.genes = list(self.genes)
+        return genoma
+
+    def _build_gene_table(self):
+        n = len(self.genes)
+        width = max([1] + [len(g.input_ids) for g in self.genes] + [len(g.output_ids) for g in self.genes])
+        in_ids = np.zeros((n, width), dtype=np.intp)
+        in_amt = np.zeros((n, width), dtype=np.float32)
+        in_len = np.zeros(n, dtype=np.intp)
+        out_ids = np.zeros((n, width), dtype=np.intp)
+        out_amt = np.zeros((n, width), dtype=np.float32)
+        out_len = np.zeros(n, dtype=np.intp)
+        for g, gene in enumerate(self.genes):
+            in_len[g] = len(gene.input_ids)
+            in_ids[g, :in_len[g]] = gene.input_ids
+            in_amt[g, :in_len[g]] = gene.input_amts
+            out_len[g] = len(gene.output_ids)
+            out_ids[g, :out_len[g]] = gene.output_ids
+            out_amt[g, :out_len[g]] = gene.output_amts
+        cost = np.array([g.cost for g in self.genes], dtype=np.float32)
+        prob = np.array([g.prob for g in self.genes], dtype=np.float32)
+        yld = np.array([g.energy_yield for g in self.genes], dtype=np.float32)
+        return (in_ids, in_amt, in_len, out_ids, out_amt, out_len, cost, prob, yld)
 
     def get_hash(self):
         """Returns a short unique hash of the genome configuration."""
-        import hashlib
-        # Sort gene IDs to ensure that order (if commutative) doesn't change hash
-        # though order usually matters for execution, let's keep it sorted for "identity"
-        gene_ids = sorted([g.get_id() for g in self.genes])
-        combined_id = "|".join(gene_ids)
-        return hashlib.md5(combined_id.encode()).hexdigest()[:6].upper()
+        # The digest is cached with the gene ids it was computed from. Gene ids
+        # are cached strings themselves, so an unchanged genome is recognized
+        # without sorting, joining or hashing anything
+        gene_ids = tuple(g.get_id_str() for g in self.genes)
+        if self._hash is None or self._hash[0] != gene_ids:
+            # Sort gene IDs to ensure that order (if commutative) doesn't change hash
+            # though order usually matters for execution, let's keep it sorted for "identity"
+            combined_id = "|".join(sorted(gene_ids))
+            self._hash = (gene_ids, hashlib.md5(combined_id.encode()).hexdigest()[:6].upper())
+        return self._hash[1]
 
     def __repr__(self):
         return f"Genoma(id={self.get_hash()}, genes={[str(g) for g in self.genes]})"
     
-    def mutate(self, gen_pool=None):
+    @staticmethod
+    def mutation_draws(n_genes):
+        """Number of uniform draws mutate() consumes for a genome of `n_genes` genes."""
+        return 4 + 4 * n_genes
+
+    def mutate(self, gen_pool=None, rand=None):
         """
         Applies random mutations to the genome.
         Types:
         1. Point Mutation: Modifies attributes of an existing gene.
         2. Duplication: Copies an existing gene.
         3. Deletion: Removes an existing gene.
+
+        The derived indexes (and the cached hash and display color) are only
+        rebuilt if some mutation actually changed the genes.
+
+        Args:
+            gen_pool: Unused.
+            rand (np.ndarray, optional): At least mutation_draws(len(genes)) uniform
+                draws in [0, 1), so callers can draw them for many genomes at once.
+                Taken from the shared draw buffer of biology.gen if omitted.
         """
         if not self.genes:
             return
+        n = len(self.genes)
+        if rand is None:
+            rand = next_rands(self.mutation_draws(n))
+        dup_roll, dup_pick, del_roll, del_pick = rand[:4].tolist()
+        point = rand[4:4 + 4 * n].tolist()
+        changed = False
 
         # 1. Point Mutation (Most common)
-        for gene in self.genes:
-            if random.random() < 0.08: # 8% chance per gene to tweak cost
-                 gene.cost = max(0.1, gene.cost + random.uniform(-0.1, 0.1))
+        # Genes may be shared with other genomes: swap in the (shared) variant
+        # instead of modifying the gene in place
+        for i, gene in enumerate(self.genes):
+            cost_roll, cost_step, prob_roll, prob_step = point[4 * i:4 * i + 4]
+            cost, prob = gene.cost, gene.prob
+            if cost_roll < 0.08: # 8% chance per gene to tweak cost
+                 cost = max(0.1, cost + (0.2 * cost_step - 0.1))
             
-            if random.random() < 0.05: # 5% chance per gene to tweak prob
-                gene.prob = min(1.0, max(0.1, gene.prob + random.uniform(-0.1, 0.1)))
+            if prob_roll < 0.05: # 5% chance per gene to tweak prob
+                prob = min(1.0, max(0.1, prob + (0.2 * prob_step - 0.1)))
+
+            if cost != gene.cost or prob != gene.prob:
+                self.genes[i] = gene.variant(cost, prob)
+                changed = True
 
         # 2. Gene Duplication (Rare)
-        if random.random() < 0.05: # % chance
-            target = random.choice(self.genes)
-            # Create a shallow copy (or deep if needed, but new instance is safer)
-            import copy
-            new_gen = copy.deepcopy(target)
-            self.genes.append(new_gen)
+        if dup_roll < 0.05: # % chance
+            target = self.genes[int(dup_pick * len(self.genes))]
+            # Genes are never modified in place, so the copy can share the instance
+            self.genes.append(target)
+            changed = True
 
         # 3. Gene Deletion (Very Rare, dangerous)
-        if len(self.genes) > 1 and random.random() < 0.01: # 1% chance
-            self.genes.pop(random.randint(0, len(self.genes)-1))
\ No newline at end of file
+        if len(self.genes) > 1 and del_roll < 0.01: # 1% chance
+            self.genes.pop(int(del_pick * len(self.genes)))
+            changed = True
+
+        if changed:
+            self._build_indexes()
\ No newline at end of file
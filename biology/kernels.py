@@ -0,0 +1,311 @@
+"""
+Optional Numba-compiled kernels for the simulation and rendering hot paths.
+
+Numba is not a hard dependency: when it is not installed every kernel
+here is None and callers fall back to their NumPy/Python implementation.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def metabolize_kernel(chem, energy, in_ids, in_amt, in_len, out_ids, out_amt, out_len,
+                          cost, prob, yld, rand_u):
+        """
+        Runs every gene of one genome, in order, against a cell's chemistry.
+
+        Same semantics as calling Gen.can_react / Gen.reaction for each gene:
+        a gene that can react always pays its cost, and on success (rand_u <= prob)
+        consumes its inputs, adds its outputs and yields energy.
+
+        Args:
+            chem (np.ndarray): float32 chemistry vector of the cell, modified in place.
+            energy (float): Current energy of the cell.
+            in_ids, in_amt, in_len, out_ids, out_amt, out_len, cost, prob, yld:
+                The genome's gene table (see Genoma._build_indexes).
+            rand_u (np.ndarray): One uniform draw in [0, 1) per gene.
+
+        Returns:
+            float: The new energy level.
+        """
+        for g in range(cost.shape[0]):
+            if energy < cost[g]:
+                continue
+            can_react = True
+            for k in range(in_len[g]):
+                if chem[in_ids[g, k]] < in_amt[g, k]:
+                    can_react = False
+                    break
+            if not can_react:
+                continue
+            if rand_u[g] > prob[g]:
+                energy -= cost[g]
+                continue
+            for k in range(in_len[g]):
+                chem[in_ids[g, k]] -= in_amt[g, k]
+            for k in range(out_len[g]):
+                chem[out_ids[g, k]] += out_amt[g, k]
+            energy += yld[g] - cost[g]
+        return energy
+
+    @njit(parallel=True, cache=True)
+    def metabolize_pool_kernel(living, energy, chem, in_ids, in_amt, out_ids, out_amt,
+                               cost, prob, yld, rand):
+        """
+        Runs the genetic reactions of many pooled cells, one thread chunk per cell range.
+
+        Same semantics as CellPool.metabolize: genes in order, a gene that can
+        react pays its cost, and on success consumes inputs, adds outputs and
+        yields energy. Padded gene slots have an infinite cost and zero amounts.
+
+        Args:
+            living (np.ndarray): Row indices of the cells to metabolize.
+            energy, chem, in_ids, in_amt, out_ids, out_amt, cost, prob, yld:
+                The CellPool arrays, modified in place.
+            rand (np.ndarray): Uniform draws of shape (len(living), genes).
+        """
+        n_genes = cost.shape[1]
+        width = in_ids.shape[2]
+        for i in prange(living.shape[0]):
+            r = living[i]
+            e = energy[r]
+            for g in range(n_genes):
+                if e < cost[r, g]:
+                    continue
+                can_react = True
+                for k in range(width):
+                    if chem[r, in_ids[r, g, k]] < in_amt[r, g, k]:
+                        can_react = False
+                        break
+                if not can_react:
+                    continue
+                e -= cost[r, g]
+                if rand[i, g] > prob[r, g]:
+                    continue
+                for k in range(width):
+                    chem[r, in_ids[r, g, k]] -= in_amt[r, g, k]
+                for k in range(width):
+                    chem[r, out_ids[r, g, k]] += out_amt[r, g, k]
+                e += yld[r, g]
+            energy[r] = e
+
+    @njit(parallel=True, cache=True)
+    def step_pool_kernel(size, energy, age, alive, cooldown, ready, chem, tolerance):
+        """
+        Internal processes of the first `size` pooled cells in one pass per cell.
+
+        Same semantics and float32 arithmetic as CellPool.step: dissipation,
+        toxicity, cooldown, death and division readiness, then aging, for
+        living rows. The chemistry sums run in molecule order rather than
+        NumPy's pairwise order, so they may differ in the last bit.
+
+        Args:
+            size (int): Number of rows in use.
+            energy, age, alive, cooldown, ready, chem, tolerance:
+                The CellPool arrays, modified in place.
+        """
+        base_cost = np.float32(0.1)
+        age_cost = np.float32(0.0005)
+        damage = np.float32(0.2)
+        n_mols = chem.shape[1]
+        for r in prange(size):
+            ready[r] = False
+            if not alive[r]:
+                continue
+            e = energy[r] - (base_cost + age_cost * np.float32(age[r]))
+
+            excess = np.float32(0)
+            total = np.float32(0)
+            for m in range(n_mols):
+                amount = chem[r, m]
+                total += amount
+                if amount > tolerance[r, m]:
+                    excess += amount - tolerance[r, m]
+            e -= damage * excess
+            energy[r] = e
+
+            if cooldown[r] > 0:
+                cooldown[r] -= 1
+            elif e < 0:
+                alive[r] = False
+            else:
+                ready[r] = total >= 5 and e > 5
+            age[r] += 1
+
+    @njit(parallel=True, cache=True)
+    def diffuse_kernel(src, dst, rate):
+        """
+        One diffusion step of stacked molecule grids with wrapped edges.
+
+        Fused single pass of World.diffuse: each cell of `dst` is
+        src * (1 - rate) + (west + east + north + south) * (rate / 4),
+        with the same float32 operation order as the NumPy version.
+
+        Args:
+            src (np.ndarray): float32 grids of shape (molecules, cols, rows).
+            dst (np.ndarray): Output array of the same shape (must not alias src).
+            rate (float): Diffusion rate.
+        """
+        n_mols, cols, rows = src.shape
+        keep = np.float32(1 - rate)
+        spread = np.float32(rate / 4)
+        for mi in prange(n_mols * cols):
+            m = mi // cols
+            i = mi % cols
+            col = src[m, i]
+            west = src[m, i - 1 if i > 0 else cols - 1]
+            east = src[m, i + 1 if i < cols - 1 else 0]
+            out = dst[m, i]
+            for j in range(rows):
+                north = col[j - 1 if j > 0 else rows - 1]
+                south = col[j + 1 if j < rows - 1 else 0]
+                neighbor_sum = west[j] + east[j] + north + south
+                out[j] = col[j] * keep + neighbor_sum * spread
+
+    @njit(parallel=True, cache=True)
+    def plan_exchange_kernel(rows, cx, cy, stack, chem_ids, energy, needed, chem, tolerance,
+                             waste, absorb, release):
+        """
+        Fills the absorb and release matrices of World.plan_exchange in one pass per cell.
+
+        Same rules and float32 arithmetic as the NumPy version: absorb half of
+        each needed molecule present on the tile if the energy cost (0.01 per
+        unit) is affordable; release all waste and the excess above 80% of the
+        tolerance of toxic molecules.
+
+        Args:
+            rows, cx, cy (np.ndarray): Pool rows and tiles of the cells.
+            stack (np.ndarray): float32 World.chem_stack.
+            chem_ids (np.ndarray): Molecule id of each stack layer.
+            energy, needed, chem, tolerance, waste: The CellPool arrays.
+            absorb, release (np.ndarray): Zeroed float32 outputs (cells, molecules).
+        """
+        half = np.float32(0.5)
+        unit_cost = np.float32(0.01)
+        keep = np.float32(0.8)
+        n_mols = chem.shape[1]
+        for i in prange(rows.shape[0]):
+            r = rows[i]
+            e = energy[r]
+            for layer in range(chem_ids.shape[0]):
+                m = chem_ids[layer]
+                available = stack[layer, cx[i], cy[i]]
+                desired = available * half
+                if needed[r, m] and available > 0 and e > desired * unit_cost:
+                    absorb[i, m] = desired
+            for m in range(n_mols):
+                amount = chem[r, m]
+                if waste[r, m]:
+                    if amount > 0:
+                        release[i, m] = amount
+                elif amount > tolerance[r, m]:
+                    excess = amount - keep * tolerance[r, m]
+                    if excess > 0:
+                        release[i, m] = excess
+
+    @njit(cache=True)
+    def exchange_kernel(rows, cx, cy, absorb, release, layer_of, stack, energy, chem):
+        """
+        Executes an exchange plan cell by cell, in order (first-come-first-served).
+
+        Fuses every absorb and release of World.execute_exchange into a single
+        sequential pass: per cell, absorbs then releases in molecule id order,
+        with the same energy limit and float32/float64 arithmetic.
+
+        Args:
+            rows, cx, cy, absorb, release (np.ndarray): The plan from World.plan_exchange.
+            layer_of (np.ndarray): Stack layer of each molecule id (every molecule
+                in the plan must have one).
+            stack (np.ndarray): float32 World.chem_stack, modified in place.
+            energy, chem (np.ndarray): The CellPool arrays, modified in place.
+        """
+        unit_cost = np.float32(0.01)
+        n_mols = absorb.shape[1]
+        for i in range(rows.shape[0]):
+            r = rows[i]
+            x = cx[i]
+            y = cy[i]
+            for m in range(n_mols):
+                wanted = absorb[i, m]
+                if wanted == 0:
+                    continue
+                layer = layer_of[m]
+                actual = min(wanted, stack[layer, x, y])
+                if actual > 0:
+                    e = energy[r]
+                    cost = actual * unit_cost
+                    amount = actual
+                    if cost > e:
+                        amount = np.float32(np.float64(e) / 0.01)
+                        cost = e
+                    if amount > 0:
+                        chem[r, m] += amount
+                        energy[r] = e - cost
+                    stack[layer, x, y] -= amount
+            for m in range(n_mols):
+                wanted = release[i, m]
+                if wanted > 0:
+                    available = np.float64(chem[r, m])
+                    actual = min(np.float64(wanted), available)
+                    if actual > 0:
+                        chem[r, m] = np.float32(max(0.0, available - actual))
+                        stack[layer_of[m], x, y] += np.float32(actual)
+
+    @njit(parallel=True, cache=True)
+    def heatmap_kernel(stack, layers, colors, bg, rgb):
+        """
+        Mixes the chemical heatmap into a one pixel per tile RGB image in one pass.
+
+        Same float32 arithmetic as the NumPy compositing of WorldObject.draw:
+        colors weighted by concentration, normalized by the total, dimmed by
+        0.2 + 0.8 * min(1, total / 20) and clamped to 255; tiles whose total is
+        not above 0.2 get the background color.
+
+        Args:
+            stack (np.ndarray): float32 World.chem_stack.
+            layers (np.ndarray): Stack layers to mix, in accumulation order.
+            colors (np.ndarray): float32 (len(layers), 3) base color of each layer.
+            bg (np.ndarray): uint8 (3,) background color.
+            rgb (np.ndarray): uint8 output image (cols, rows, 3).
+        """
+        threshold = np.float32(0.2)
+        full = np.float32(20)
+        one = np.float32(1)
+        dim = np.float32(0.2)
+        bright = np.float32(0.8)
+        top = np.float32(255)
+        cols, rows = stack.shape[1], stack.shape[2]
+        for i in prange(cols):
+            for j in range(rows):
+                total = np.float32(0)
+                r = np.float32(0)
+                g = np.float32(0)
+                b = np.float32(0)
+                for k in range(layers.shape[0]):
+                    amount = stack[layers[k], i, j]
+                    total += amount
+                    r += amount * colors[k, 0]
+                    g += amount * colors[k, 1]
+                    b += amount * colors[k, 2]
+                if total > threshold:
+                    factor = dim + bright * min(one, total / full)
+                    rgb[i, j, 0] = np.uint8(min(top, r / total * factor))
+                    rgb[i, j, 1] = np.uint8(min(top, g / total * factor))
+                    rgb[i, j, 2] = np.uint8(min(top, b / total * factor))
+                else:
+                    rgb[i, j, 0] = bg[0]
+                    rgb[i, j, 1] = bg[1]
+                    rgb[i, j, 2] = bg[2]
+else:
+    metabolize_kernel = None
+    metabolize_pool_kernel = None
+    step_pool_kernel = None
+    diffuse_kernel = None
+    plan_exchange_kernel = None
+    exchange_kernel = None
+    heatmap_kernel = None
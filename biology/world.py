@@ -1,8 +1,16 @@
-import copy
-import random
-
 import numpy as np
-from .cell import Cell
+from . import chemistry_dict as chem
+from .action import CellAction
+from .cell import DIR_VECS, WANDER_PROB, Cell
+from .cell_pool import CellPool
+from .genoma import Genoma
+from .kernels import diffuse_kernel, exchange_kernel, plan_exchange_kernel
+
+# Placement of the second daughter around its sibling, indexed by one uniform draw
+_DIVISION_DIRS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Neighbor offsets in cell.DIRECTIONS order, as a (4, 2) array for vectorized gathers
+_NEIGHBOR_OFFSETS = np.array(DIR_VECS, dtype=np.intp)
 
 class World:
     """
@@ -11,119 +19,188 @@ class World:
     Attributes:
         width (int): The width of the grid.
         height (int): The height of the grid.
-        grid (list): Now using Numpy arrays for chemistry.
+        chem_stack (np.ndarray): Grids of every molecule, shape (molecules, cols, rows);
+            float32 unless the world was created with dtype=np.float16.
+        chemistry (dict): Molecule name -> its (cols, rows) grid, a view into chem_stack.
         cells (list): A list of Cell objects currently traversing the world.
+        pool (CellPool): Numeric state of all cells; `cells[i]` owns row `i`.
+        version (int): Change counter, bumped by every step, seeding, new molecule
+            and new cell (see touch), so views can tell when to redraw.
+        rng (np.random.Generator): Source of every random draw of step(), seeding
+            and division. The per-cell helpers (Cell.decide_actions, Gen.reaction,
+            Genoma.mutate) take a Generator or pre-drawn values, and only fall
+            back to the shared draw buffer of biology.gen without them.
     """
-    def __init__(self, width, height, cell_size):
+    # Largest concentration a float16 chem_stack may hold; seeding beyond it
+    # promotes the stack to float32
+    FLOAT16_LIMIT = 1024.0
+
+    def __init__(self, width, height, cell_size, dtype=np.float32, seed=None):
         """
         Initializes the world with a specific grid size.
 
         Args:
             width (int): Grid width.
             height (int): Grid height.
+            dtype (np.dtype, optional): Storage type of the molecule grids. np.float16
+                halves their memory traffic; they are still diffused in float32,
+                and promoted to float32 if seeded beyond FLOAT16_LIMIT.
+            seed (int, optional): Seed of the world's random generator, for
+                reproducible runs.
         """
         self.width = width
         self.height = height
         self.cell_size = cell_size
+        self.rng = np.random.default_rng(seed)
 
         self.cols = width // cell_size
         self.rows = height // cell_size
+        # Last valid tile indices, for clamping positions
+        self._cols_m1 = self.cols - 1
+        self._rows_m1 = self.rows - 1
         
-        # Dictionary of 2D numpy arrays. Key = molecule name (str), Value = np.array shape (cols, rows)
-        self.chemistry = {} 
+        # All molecule grids stacked in one array of shape (molecules, cols, rows).
+        # `chemistry` maps each molecule name to its (cols, rows) view into the stack,
+        # `chem_ids[i]` is the chemistry_dict id of layer i and `_mol_index` maps
+        # ids back to layers, so hot paths index the stack without name lookups.
+        self.chem_stack = np.zeros((0, self.cols, self.rows), dtype=dtype)
+        self.chem_ids = np.zeros(0, dtype=np.intp)
+        self._mol_index = {}
+        self.chemistry = {}
+        self._diffuse_scratch = np.empty(self.chem_stack.shape, dtype=np.float32)
 
         self.cells = []
+        self.pool = CellPool()
+        self.version = 0
 
     def _ensure_molecule(self, mol):
-        if mol not in self.chemistry:
-            self.chemistry[mol] = np.zeros((self.cols, self.rows), dtype=np.float64)
+        """Adds a zero grid for molecule `mol` if missing and returns its layer in chem_stack."""
+        mol_id = chem.get_value(mol)
+        layer = self._mol_index.get(mol_id)
+        if layer is None:
+            # Grow the stack by one layer; existing views are rebound to the new array
+            layer = len(self.chem_ids)
+            self.chem_stack = np.concatenate([self.chem_stack, np.zeros((1, self.cols, self.rows), dtype=self.chem_stack.dtype)])
+            self.chem_ids = np.append(self.chem_ids, mol_id)
+            self._mol_index[mol_id] = layer
+            self._bind_views(list(self.chemistry) + [mol])
+            self.version += 1
+        return layer
+
+    def _bind_views(self, names):
+        """Rebuilds `chemistry` as views into the current chem_stack."""
+        self.chemistry = {name: self.chem_stack[i] for i, name in enumerate(names)}
+
+    def _store_layer(self, layer, values):
+        """Writes float32 values into a layer, promoting a float16 stack to float32 if they do not fit."""
+        if self.chem_stack.dtype != np.float32 and np.abs(values).max() > self.FLOAT16_LIMIT:
+            self.chem_stack = self.chem_stack.astype(np.float32)
+            self._bind_views(list(self.chemistry))
+        self.chem_stack[layer] = values
+        self.version += 1
+
+    def touch(self):
+        """Marks the world as changed, after editing chem_stack or the cell pool directly."""
+        self.version += 1
 
     def seed(self, mol, amount):
-        self._ensure_molecule(mol)
-        self.chemistry[mol] += amount
+        layer = self._ensure_molecule(mol)
+        self._store_layer(layer, self.chem_stack[layer].astype(np.float32) + amount)
 
     def seed_clusters(self, mol, total_amount, num_clusters=5):
         """
         Seeds nutrients in concentrated clusters to form 'rich zones' and 'deserts'.
+
+        All cluster centers and drop offsets are drawn in one batch from
+        self.rng, and the drops are scattered into the grid with one np.add.at.
         """
         if num_clusters < 1: return
-        self._ensure_molecule(mol)
+        layer = self._ensure_molecule(mol)
         
         amt_per_cluster = total_amount / num_clusters
         
-        for _ in range(num_clusters):
-            # Pick a center
-            cx = random.randint(0, self.cols - 1)
-            cy = random.randint(0, self.rows - 1)
-            
-            # Spread geometry: 
-            # Radius approx 1/6th of min dimension
-            radius = max(1, min(self.cols, self.rows) // 6)
+        # Spread geometry: 
+        # Radius approx 1/6th of min dimension
+        radius = max(1, min(self.cols, self.rows) // 6)
 
-            # Number of splats/drops
-            drops = 50
-            drop_val = amt_per_cluster / drops
-            
-            for _ in range(drops):
-                # Random offset within radius
-                ox = int(random.gauss(cx, radius / 2))
-                oy = int(random.gauss(cy, radius / 2))
-                
-                # Clamp to grid
-                ox = max(0, min(self.cols - 1, ox))
-                oy = max(0, min(self.rows - 1, oy))
-                
-                # Add to grid
-                self.chemistry[mol][ox, oy] += drop_val
+        # Number of splats/drops
+        drops = 50
+        drop_val = amt_per_cluster / drops
+
+        # Pick the centers, then random offsets within radius of each
+        cx = self.rng.integers(0, self.cols, num_clusters)
+        cy = self.rng.integers(0, self.rows, num_clusters)
+        ox = self.rng.normal(cx[:, None], radius / 2, (num_clusters, drops)).astype(np.intp)
+        oy = self.rng.normal(cy[:, None], radius / 2, (num_clusters, drops)).astype(np.intp)
+
+        # Clamp to grid
+        np.clip(ox, 0, self.cols - 1, out=ox)
+        np.clip(oy, 0, self.rows - 1, out=oy)
+
+        # Add to grid (np.add.at accumulates drops landing on the same tile)
+        grid = self.chem_stack[layer].astype(np.float32)
+        np.add.at(grid, (ox.ravel(), oy.ravel()), drop_val)
+        self._store_layer(layer, grid)
 
     def add_cell(self, cell, x, y):
         """
         Places a cell into the world at a specific coordinate.
         """
+        cell._attach(self.pool)
         cell.x = x
         cell.y = y
         self.cells.append(cell)
+        self.version += 1
 
     def diffuse(self, rate=0.1):
         """
         Simulates the diffusion of chemicals using vectorized numpy operations.
         new_val = val * (1 - rate) + (sum_neighbors * rate / 4)
+
+        All molecules are diffused at once on the stacked grids. Edges wrap
+        around (toroidal environment), and neighbor sums are accumulated from
+        shifted slice views into one reused scratch buffer instead of four
+        rolled copies per molecule. With Numba the stencil is a fused kernel
+        writing into a second buffer, which is then swapped with the stack.
+        A float16 stack is diffused as a float32 copy and stored back rounded.
         """
-        for mol in self.chemistry:
-            grid = self.chemistry[mol]
-            
-            # vectorized neighbor sum using roll (periodic boundary conditions, effectively wraps around)
-            # If we want hard boundaries, we might need to mask, but wrapping is often acceptable or we pad.
-            # Original code had boundary checks `if 0 <= nx < self.cols...`. 
-            # `np.roll` wraps. To strictly match "no wrap" behavior of original `diffuse`:
-            # However, for performance, wrapping is much faster. 
-            # Let's try to simulate non-wrapping by padding or accept wrapping (topology change).
-            # Given the "Basic Life" nature, wrapping (toroidal) is actually standard and often preferred.
-            # But the user logic explicitly checked boundaries. 
-            
-            # Implementation with np.roll (toroidal env):
-            # north = np.roll(grid, -1, axis=1)
-            # south = np.roll(grid, 1, axis=1)
-            # east = np.roll(grid, -1, axis=0)
-            # west = np.roll(grid, 1, axis=0)
-            
-            # If we strictly want to loose mass at edges (or just not wrap), we'd need to zero out the rolled parts.
-            # But for now, let's use the standard fast diffusion.
-            
-            neighbor_sum = (
-                np.roll(grid, 1, axis=0) + 
-                np.roll(grid, -1, axis=0) + 
-                np.roll(grid, 1, axis=1) + 
-                np.roll(grid, -1, axis=1)
-            )
-            
-            # We must correct edges if we don't want wrapping.
-            # Setting rolled edges to 0 is complex. 
-            # For this iteration, I will allow toroidal wrapping as a "feature" of the high-perf engine,
-            # or I can implement detailed padding. Let's stick to wrapping for speed.
-            
-            self.chemistry[mol] = grid * (1 - rate) + (neighbor_sum * rate / 4)
-            
+        stack = self.chem_stack
+        if len(stack) == 0:
+            return
+        half = stack.dtype != np.float32
+        if half:
+            stack = stack.astype(np.float32)
+        if self._diffuse_scratch.shape != stack.shape:
+            self._diffuse_scratch = np.empty_like(stack)
+
+        if diffuse_kernel is not None:
+            diffuse_kernel(stack, self._diffuse_scratch, rate)
+            if half:
+                self.chem_stack[...] = self._diffuse_scratch
+                return
+            self.chem_stack, self._diffuse_scratch = self._diffuse_scratch, stack
+            self._bind_views(list(self.chemistry))
+            return
+
+        neighbor_sum = self._diffuse_scratch
+
+        # West, east, north and south neighbors, in that order
+        neighbor_sum[:, 1:] = stack[:, :-1]
+        neighbor_sum[:, 0] = stack[:, -1]
+        neighbor_sum[:, :-1] += stack[:, 1:]
+        neighbor_sum[:, -1] += stack[:, 0]
+        neighbor_sum[:, :, 1:] += stack[:, :, :-1]
+        neighbor_sum[:, :, 0] += stack[:, :, -1]
+        neighbor_sum[:, :, :-1] += stack[:, :, 1:]
+        neighbor_sum[:, :, -1] += stack[:, :, 0]
+
+        # One scaling pass instead of two: dividing by 4 is exact in floating
+        # point, so this gives the same values as `* rate` then `/ 4`
+        neighbor_sum *= rate / 4
+        stack *= 1 - rate
+        stack += neighbor_sum
+        if half:
+            self.chem_stack[...] = stack
     
     def get_local_chemistry(self, x, y):
         """
@@ -134,12 +211,9 @@ class World:
             y (int): Grid y coordinate.
             
         Returns:
-            dict: Chemistry at that position.
+            np.ndarray: float32 vector (MAX_MOLECULES,) indexed by molecule id.
         """
-        result = {}
-        for mol, grid in self.chemistry.items():
-            result[mol] = grid[x, y]
-        return result
+        return self.local_chemistry(np.array([x]), np.array([y]))[0]
     
     def get_neighbors_chemistry(self, x, y):
         """
@@ -150,29 +224,60 @@ class World:
             y (int): Grid y coordinate.
             
         Returns:
-            dict: Chemistry at neighbors with keys 'N', 'S', 'E', 'W'.
+            np.ndarray: float32 array (4, MAX_MOLECULES), one row per direction
+            in cell.DIRECTIONS order (N, S, E, W). Out of bounds rows are zero.
         """
-        neighbors = {}
-        directions = {
-            'N': (0, -1),
-            'S': (0, 1),
-            'E': (1, 0),
-            'W': (-1, 0)
-        }
-        
-        for dir_name, (dx, dy) in directions.items():
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.cols and 0 <= ny < self.rows:
-                neighbors[dir_name] = self.get_local_chemistry(nx, ny)
-            else:
-                neighbors[dir_name] = {}  # Out of bounds
-        
+        return self.neighbors_chemistry(np.array([x]), np.array([y]))[0]
+
+    def local_chemistry(self, cx, cy):
+        """
+        Gathers the chemistry of many tiles with one fancy index into the stack.
+
+        Args:
+            cx (np.ndarray): Tile x coordinates.
+            cy (np.ndarray): Tile y coordinates (same length as `cx`).
+
+        Returns:
+            np.ndarray: float32 matrix (tiles, MAX_MOLECULES) indexed by molecule id.
+        """
+        env = np.zeros((len(cx), chem.MAX_MOLECULES), dtype=np.float32)
+        env[:, self.chem_ids] = self.chem_stack[:, cx, cy].T
+        return env
+
+    def neighbors_chemistry(self, cx, cy):
+        """
+        Gathers the chemistry of the 4 neighbors of many tiles at once.
+
+        Args:
+            cx (np.ndarray): Tile x coordinates.
+            cy (np.ndarray): Tile y coordinates (same length as `cx`).
+
+        Returns:
+            np.ndarray: float32 array (tiles, 4, MAX_MOLECULES), neighbors in
+            cell.DIRECTIONS order. Out of bounds neighbors are zero.
+        """
+        gathered = np.moveaxis(self._neighbor_layers(cx, cy), 0, -1)
+        neighbors = np.zeros(gathered.shape[:2] + (chem.MAX_MOLECULES,), dtype=np.float32)
+        neighbors[:, :, self.chem_ids] = gathered
         return neighbors
 
+    def _neighbor_layers(self, cx, cy):
+        """Neighbor chemistry per world layer, shape (layers, tiles, 4), zero out of bounds."""
+        nx = np.asarray(cx, dtype=np.intp)[:, None] + _NEIGHBOR_OFFSETS[:, 0]
+        ny = np.asarray(cy, dtype=np.intp)[:, None] + _NEIGHBOR_OFFSETS[:, 1]
+        inside = (nx >= 0) & (nx < self.cols) & (ny >= 0) & (ny < self.rows)
+
+        # Gather clamped tiles, then zero the out of bounds ones
+        gathered = self.chem_stack[:, np.clip(nx, 0, self._cols_m1), np.clip(ny, 0, self._rows_m1)]
+        gathered[:, ~inside] = 0
+        return gathered
+
     def cell_tile(self, cell):
-        # Clamp to ensure we don't index out of bounds if cell moves out
-        cx = max(0, min(self.cols - 1, int(cell.x)))
-        cy = max(0, min(self.rows - 1, int(cell.y)))
+        # Clamp to ensure we don't index out of bounds if cell moves out.
+        # Plain comparisons against precomputed bounds avoid the min/max builtin calls
+        cx, cy = int(cell.x), int(cell.y)
+        cx = 0 if cx < 0 else (self._cols_m1 if cx > self._cols_m1 else cx)
+        cy = 0 if cy < 0 else (self._rows_m1 if cy > self._rows_m1 else cy)
         return cx, cy
 
     def execute_actions(self, actions_by_cell):
@@ -182,59 +287,229 @@ class World:
         Args:
             actions_by_cell (dict): Mapping of Cell -> list[CellAction].
         """
-        from .action import CellAction
-        
         for cell, actions in actions_by_cell.items():
             if not cell.alive:
                 continue
             
             for action in actions:
-                if action.type == CellAction.ABSORB:
+                action_type = action[0]
+                if action_type == CellAction.ABSORB:
                     self._execute_absorb(cell, action)
-                elif action.type == CellAction.RELEASE:
+                elif action_type == CellAction.RELEASE:
                     self._execute_release(cell, action)
-                elif action.type == CellAction.MOVE:
+                elif action_type == CellAction.MOVE:
                     self._execute_move(cell, action)
     
     def _execute_absorb(self, cell, action):
         """Executes an absorption action."""
-        molecule = action.params['molecule']
-        amount = action.params['amount']
+        mol_id, amount = action.molecule, action.amount
         
         cx, cy = self.cell_tile(cell)
-        self._ensure_molecule(molecule)
+        layer = self._ensure_molecule(chem.get_name(mol_id))
         
         # Check availability
-        available = self.chemistry[molecule][cx, cy]
+        available = self.chem_stack[layer, cx, cy]
         actual_amount = min(amount, available)
         
         if actual_amount > 0:
             # Cell absorbs (with energy cost)
-            absorbed = cell.absorb(molecule, actual_amount)
+            absorbed = cell.absorb(mol_id, actual_amount)
             # Remove from environment
-            self.chemistry[molecule][cx, cy] -= absorbed
+            self.chem_stack[layer, cx, cy] -= absorbed
     
     def _execute_release(self, cell, action):
         """Executes a release action."""
-        molecule = action.params['molecule']
-        amount = action.params['amount']
+        mol_id, amount = action.molecule, action.amount
         
         cx, cy = self.cell_tile(cell)
-        self._ensure_molecule(molecule)
+        layer = self._ensure_molecule(chem.get_name(mol_id))
         
         # Cell releases
-        released = cell.release(molecule, amount)
+        released = cell.release(mol_id, amount)
         
         if released > 0:
             # Add to environment
-            self.chemistry[molecule][cx, cy] += released
+            self.chem_stack[layer, cx, cy] += released
     
+    def plan_exchange(self, cells):
+        """
+        Decides the absorptions and releases of many cells at once.
+
+        Vectorized equivalent of calling Cell.decide_exchange on every cell
+        with the chemistry of its tile. With Numba (and a float32 stack) the
+        matrices are filled by a single parallel pass over the cells.
+
+        Args:
+            cells (list[Cell]): Living cells, in execution order.
+
+        Returns:
+            tuple: (rows, cx, cy, absorb, release) where `rows`, `cx` and `cy`
+            are the pool rows and tiles of the cells, and `absorb` / `release`
+            are float32 matrices (cells, MAX_MOLECULES) of the requested amounts
+            (0 where no action is wanted).
+        """
+        pool = self.pool
+        rows = np.array([cell._row for cell in cells], dtype=np.intp)
+        cx = np.clip(pool.x[rows].astype(np.intp), 0, self._cols_m1)
+        cy = np.clip(pool.y[rows].astype(np.intp), 0, self._rows_m1)
+        if plan_exchange_kernel is not None and self.chem_stack.dtype == np.float32:
+            absorb = np.zeros((len(rows), chem.MAX_MOLECULES), dtype=np.float32)
+            release = np.zeros_like(absorb)
+            plan_exchange_kernel(rows, cx, cy, self.chem_stack, self.chem_ids, pool.energy,
+                                 pool.needed, pool.chem, pool.tolerance, pool.waste, absorb, release)
+            return rows, cx, cy, absorb, release
+
+        # Absorb up to 50% of what is available, if the energy cost (0.01 per unit) is affordable
+        env = self.local_chemistry(cx, cy)
+        desired = env * 0.5
+        energy = pool.energy[rows][:, None]
+        absorb = np.where(pool.needed[rows] & (env > 0) & (energy > desired * 0.01), desired, 0)
+
+        # Release all waste, or the excess above 80% of tolerance of toxic molecules
+        chemistry = pool.chem[rows]
+        tolerance = pool.tolerance[rows]
+        waste = pool.waste[rows]
+        release = np.where(waste, chemistry, chemistry - 0.8 * tolerance)
+        release = np.where((waste | (chemistry > tolerance)) & (release > 0), release, 0)
+        return rows, cx, cy, absorb.astype(np.float32), release.astype(np.float32)
+
+    def execute_exchange(self, plan):
+        """
+        Executes a plan from plan_exchange (first-come-first-served per tile).
+
+        Cells are processed in rounds by their rank among the cells sharing
+        their tile, so each round touches every tile at most once and is
+        vectorized, while cells on a shared tile still act in list order.
+        With Numba (and a float32 stack) the whole plan runs as one
+        sequential compiled pass over the cells instead.
+
+        Args:
+            plan (tuple): Result of plan_exchange.
+        """
+        rows, cx, cy, absorb, release = plan
+        if len(rows) == 0:
+            return
+        if exchange_kernel is not None and self.chem_stack.dtype == np.float32:
+            for mol_id in np.flatnonzero(release.any(axis=0)).tolist():
+                self._ensure_molecule(chem.get_name(mol_id))
+            layer_of = np.full(chem.MAX_MOLECULES, -1, dtype=np.intp)
+            layer_of[self.chem_ids] = np.arange(len(self.chem_ids))
+            exchange_kernel(rows, cx, cy, absorb, release, layer_of, self.chem_stack,
+                            self.pool.energy, self.pool.chem)
+            return
+        tile = cx * self.rows + cy
+        order = np.argsort(tile, kind="stable")
+        sorted_tile = tile[order]
+        starts = np.flatnonzero(np.r_[True, sorted_tile[1:] != sorted_tile[:-1]])
+        group_start = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        rank = np.empty(len(order), dtype=np.intp)
+        rank[order] = np.arange(len(order)) - group_start
+
+        for r in range(int(rank.max()) + 1):
+            sel = np.flatnonzero(rank == r)
+            self._exchange_round(rows[sel], cx[sel], cy[sel], absorb[sel], release[sel])
+
+    def _exchange_round(self, rows, cx, cy, absorb, release):
+        """Absorbs then releases, molecule by molecule, for cells on distinct tiles."""
+        pool = self.pool
+        energy = pool.energy
+
+        for mol_id in np.flatnonzero(absorb.any(axis=0)).tolist():
+            grid = self.chem_stack[self._mol_index[mol_id]]
+            actual = np.minimum(absorb[:, mol_id], grid[cx, cy])
+            acting = actual > 0
+            rows_m, cx_m, cy_m, actual = rows[acting], cx[acting], cy[acting], actual[acting]
+
+            # Same energy limit as Cell.absorb
+            cell_energy = energy[rows_m]
+            cost = actual * np.float32(0.01)
+            over = cost > cell_energy
+            amount = np.where(over, (cell_energy.astype(np.float64) / 0.01).astype(np.float32), actual)
+            cost = np.where(over, cell_energy, cost)
+            gain = amount > 0
+            pool.chem[rows_m[gain], mol_id] += amount[gain]
+            energy[rows_m[gain]] = cell_energy[gain] - cost[gain]
+            grid[cx_m, cy_m] -= amount
+
+        for mol_id in np.flatnonzero(release.any(axis=0)).tolist():
+            layer = self._ensure_molecule(chem.get_name(mol_id))
+            wanted = release[:, mol_id] > 0
+            rows_m = rows[wanted]
+            available = pool.chem[rows_m, mol_id].astype(np.float64)
+            actual = np.minimum(release[wanted, mol_id], available)
+            released = actual > 0
+            pool.chem[rows_m[released], mol_id] = np.maximum(0.0, available - actual)[released]
+            self.chem_stack[layer, cx[wanted][released], cy[wanted][released]] += actual[released].astype(np.float32)
+
+    def plan_moves(self, rows, cx, cy, wander=None):
+        """
+        Decides the chemotaxis and passive moves of many cells at once.
+
+        Vectorized equivalent of calling Cell._decide_movement on every cell
+        with the chemistry of its tile and neighbors. Utilities are accumulated
+        molecule by molecule in id order, like the per-cell sums, so both give
+        the same float32 results.
+
+        Args:
+            rows (np.ndarray): Pool rows of the cells.
+            cx (np.ndarray): Tile x coordinate of each cell.
+            cy (np.ndarray): Tile y coordinate of each cell.
+            wander (tuple, optional): Pre-drawn (uniform draws, direction indices)
+                arrays for the passive movement, one entry per cell. Drawn if omitted.
+
+        Returns:
+            tuple: (rows, dx, dy, cost) arrays describing the cells that move.
+        """
+        pool = self.pool
+        n = len(rows)
+        if wander is None:
+            wander = (self.rng.random(n), self.rng.integers(0, len(DIR_VECS), n))
+        wander_u, wander_dir = wander
+
+        # Needed molecules here and at each neighbor, per world layer
+        needed = pool.needed[rows[:, None], self.chem_ids]
+        here = self.chem_stack[:, cx, cy]
+        neighbors = self._neighbor_layers(cx, cy)
+        current = np.zeros(n, dtype=np.float32)
+        utilities = np.zeros((n, len(DIR_VECS)), dtype=np.float32)
+        for layer in np.argsort(self.chem_ids).tolist():
+            wants = needed[:, layer]
+            current += np.where(wants, here[layer], 0)
+            utilities += np.where(wants[:, None], neighbors[layer], 0)
+
+        # Only hungry cells with needs and enough energy consider moving
+        active = pool.needed[rows].any(axis=1) & ~(current > 0.5) & ~(pool.energy[rows] < 0.5)
+
+        # Best neighbor (first of equals), if it is at least 5% better
+        best = utilities.argmax(axis=1)
+        chemotaxis = active & (utilities[np.arange(n), best] > current * 1.05)
+
+        # Passive random movement (5% chance)
+        wandering = active & ~chemotaxis & (wander_u < WANDER_PROB)
+
+        moving = np.flatnonzero(chemotaxis | wandering)
+        direction = np.where(chemotaxis, best, wander_dir)[moving]
+        vecs = _NEIGHBOR_OFFSETS[direction]
+        cost = np.where(chemotaxis[moving], np.float32(0.5), np.float32(0))
+        return rows[moving], vecs[:, 0], vecs[:, 1], cost
+
+    def execute_moves(self, moves):
+        """
+        Executes a plan from plan_moves: steps every moving cell, clamped to
+        the grid, and charges its movement cost.
+
+        Args:
+            moves (tuple): Result of plan_moves.
+        """
+        rows, dx, dy, cost = moves
+        pool = self.pool
+        pool.x[rows] = np.clip(pool.x[rows] + dx, 0, self._cols_m1)
+        pool.y[rows] = np.clip(pool.y[rows] + dy, 0, self._rows_m1)
+        pool.energy[rows] -= cost
+
     def _execute_move(self, cell, action):
         """Executes a movement action."""
-        direction = action.params['direction']
-        cost = action.params.get('cost', 0)
-        
-        dx, dy = direction
+        _, _, _, dx, dy, cost = action
         new_x = cell.x + dx
         new_y = cell.y + dy
         
@@ -252,79 +527,118 @@ class World:
         Advances the world state by one step using agent-based execution model.
         
         Phase 1: Physics (diffusion)
-        Phase 2: Cell observation & decision-making
+        Phase 2: Cell observation & decision-making (metabolism batched over the pool)
         Phase 3: Action execution (with conflict resolution)
         Phase 4: Internal processes & consequences (death, division)
         """
+        self.version += 1
+
         # Phase 1: Physics
         self.diffuse()
         
-        # Phase 2: Cell observation & decision-making
-        actions_by_cell = {}
-        for cell in self.cells:
-            if not cell.alive:
-                continue
-            
-            cx, cy = self.cell_tile(cell)
-            env_chemistry = self.get_local_chemistry(cx, cy)
-            neighbors_chemistry = self.get_neighbors_chemistry(cx, cy)
-            
-            actions = cell.decide_actions(env_chemistry, neighbors_chemistry)
-            actions_by_cell[cell] = actions
+        # Phase 2: Cell observation & decision-making, vectorized over the population
+        # Same order as Cell.decide_actions: exchange, metabolism, movement
+        alive = self.pool.alive[:self.pool.size].tolist()
+        living = [cell for cell, is_alive in zip(self.cells, alive) if is_alive]
+        exchange = self.plan_exchange(living)
+        self.pool.metabolize(self.rng.random((len(living), self.pool.gene_cost.shape[1])))
+        rows, cx, cy, _, _ = exchange
+        moves = self.plan_moves(rows, cx, cy)
         
-        # Phase 3: Execute actions
-        self.execute_actions(actions_by_cell)
+        # Phase 3: Execute actions. A cell's exchange only interacts with cells
+        # on the same tile, so running every exchange before the moves keeps
+        # the per-cell first-come-first-served outcome
+        self.execute_exchange(exchange)
+        self.execute_moves(moves)
         
         # Phase 4: Internal processes & consequences
-        new_cells = []
-        for cell in self.cells:
-            # Internal processes: dissipate, assess_state, age
-            cell.step()
-            
+        # Internal processes (dissipate, assess_state, age) for the whole population at once
+        self.pool.step()
+
+        # Randomness for every division of this tick, drawn in one batch:
+        # one row per dividing cell with the placement draw and two mutation slices
+        alive = self.pool.alive[:self.pool.size]
+        ready = self.pool.ready[:self.pool.size]
+        dividing = np.flatnonzero(ready & alive)
+        width = max((Genoma.mutation_draws(len(self.cells[i].genoma.genes)) for i in dividing.tolist()), default=0)
+        division_rand = iter(self.rng.random((len(dividing), 1 + 2 * width)))
+
+        # Cells before the first death or division keep their list slot and
+        # pool row; only the tail after it is rebuilt
+        changed = np.flatnonzero(~alive | ready)
+        if len(changed) == 0:
+            return
+        start = int(changed[0])
+
+        # At most two daughters per cell: preallocate and fill by index
+        new_cells = [None] * (2 * (len(self.cells) - start))
+        k = 0
+        for cell in self.cells[start:]:
             # Remove dead cells
             if not cell.alive:
                 continue
             
             # Division
             if cell.ready_to_divide:
-                daughters = self.divide_cell(cell)
-                new_cells.extend(daughters)
+                new_cells[k], new_cells[k + 1] = self.divide_cell(cell, next(division_rand))
+                k += 2
             else:
-                new_cells.append(cell)
+                new_cells[k] = cell
+                k += 1
+        del new_cells[k:]
         
-        self.cells = new_cells
+        # Pack surviving rows so that cells[i] owns row i again
+        self.pool.compact([cell._row for cell in new_cells], start)
+        for row, cell in enumerate(new_cells, start):
+            cell._row = row
+        self.cells[start:] = new_cells
+
+    def divide_cell(self, cell, rand=None):
+        """
+        Splits a cell into two mutated daughters.
+
+        Args:
+            cell (Cell): Dividing cell.
+            rand (np.ndarray, optional): Uniform draws: one for the placement of the
+                second daughter followed by two equal halves for the mutations of
+                each genome (see Genoma.mutation_draws). Drawn if omitted.
+
+        Returns:
+            list[Cell]: The two daughters.
+        """
+        if rand is None:
+            rand = self.rng.random(1 + 2 * Genoma.mutation_draws(len(cell.genoma.genes)))
+        width = (len(rand) - 1) // 2
 
-    def divide_cell(self, cell):
         # copiar genoma
-        g1 = copy.deepcopy(cell.genoma)
-        g2 = copy.deepcopy(cell.genoma)
+        g1 = cell.genoma.clone()
+        g2 = cell.genoma.clone()
 
         # mutaciones independientes
-        g1.mutate()
-        g2.mutate()
+        g1.mutate(rand=rand[1:1 + width])
+        g2.mutate(rand=rand[1 + width:])
 
         # crear hijas
-        c1 = Cell(g1)
+        c1 = Cell(g1, self.pool)
         c1.ready_to_divide = False
         c1.division_cooldown = 5
         c1.energy = cell.energy * 0.45
-        c2 = Cell(g2)
+        c2 = Cell(g2, self.pool)
         c2.ready_to_divide = False
         c2.division_cooldown = 5
         c2.energy = cell.energy * 0.45
 
         # repartir química
-        for mol, amt in cell.chemistry.items():
-            half = amt / 2
-            c1.chemistry[mol] = half
-            c2.chemistry[mol] = amt - half
+        half = cell.chemistry / 2
+        c1.chemistry = half
+        c2.chemistry = cell.chemistry - half
 
         # posición espacial
         x, y = cell.x, cell.y
         c1.x, c1.y = x, y
 
         # intentar poner la otra cerca
-        dx, dy = random.choice([(-1,0),(1,0),(0,-1),(0,1)])
+        dx, dy = _DIVISION_DIRS[int(rand[0] * len(_DIVISION_DIRS))]
         c2.x = max(0, min(self.cols-1, x+dx))
         c2.y = max(0, min(self.rows-1, y+dy))
 
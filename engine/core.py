@@ -10,9 +10,17 @@ class Engine:
         self.running = True
         self.input_manager = InputManager()
         self.objects = []
+        # Bound update/draw methods of the objects, resolved once in add_object
+        self._updates = []
+        self._draws = []
+        # Whether every object opted into dirty-rect drawing (see run)
+        self._partial_draws = False
 
     def add_object(self, obj):
         self.objects.append(obj)
+        self._updates.append(obj.update)
+        self._draws.append(obj.draw)
+        self._partial_draws = all(getattr(o, "supports_dirty_rects", False) for o in self.objects)
 
     def run(self):
         while self.running:
@@ -28,14 +36,34 @@ class Engine:
             # print(f"Looping... dt={dt}", end='\r') # Debug
             
             # Update
-            for obj in self.objects:
-                obj.update(dt)
+            for update in self._updates:
+                update(dt)
             
             # Draw
-            self.screen.fill((0, 0, 0)) # Limpiar pantalla con negro
-            for obj in self.objects:
-                obj.draw(self.screen)
-            
-            pygame.display.flip()
+            screen = self.screen
+            if not self._partial_draws:
+                screen.fill((0, 0, 0)) # Limpiar pantalla con negro
+                for draw in self._draws:
+                    draw(screen)
+                pygame.display.flip()
+                continue
+
+            # Every object opted in with supports_dirty_rects: they paint their
+            # own background, so the screen is not cleared, and draw(screen,
+            # partial=True) returns the list of rects it changed, or None when
+            # anything may have changed. The whole display is only flipped then
+            full_redraw = False
+            dirty_rects = []
+            for draw in self._draws:
+                rects = draw(screen, partial=True)
+                if rects is None:
+                    full_redraw = True
+                else:
+                    dirty_rects.extend(rects)
+
+            if full_redraw:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
 
         pygame.quit()
@@ -15,6 +15,7 @@ class InputManager:
                 self.quit_requested = True
     
     def is_key_pressed(self, key_code):
-        if key_code < len(self.keys):
-            return self.keys[key_code]
-        return False
+        # pygame's ScancodeWrapper maps key codes itself and returns False for
+        # unknown ones, so no bounds check is needed (it also wrongly rejected
+        # SDL2 key codes above 512 such as the arrow keys)
+        return self.keys[key_code]
@@ -1,12 +1,71 @@
+import functools
+import itertools
 import pygame
 import colorsys
+import hashlib
 import numpy as np
 
+from biology import chemistry_dict as chem
+from biology.kernels import heatmap_kernel
+
+
+# Genes keep their yields when they mutate, so genomes share a few
+# (signature, gene count, average yield) keys: md5 and colorsys run once per key
+@functools.lru_cache(maxsize=4096)
+def _signature_color(signature, num_genes, avg_yield):
+    """
+    Maps a genome signature (see WorldObject._get_genome_signature) to its RGB color.
+
+    Args:
+        signature (tuple): Functional signature of the genome.
+        num_genes (int): Number of genes.
+        avg_yield (float): Average energy yield of the genes.
+
+    Returns:
+        tuple: (r, g, b) color.
+    """
+    sig_hash = hashlib.md5(_signature_text(signature).encode()).hexdigest()
+
+    # Use first 6 hex chars for color (like web colors)
+    # Convert to HSV for better control
+    hash_int = int(sig_hash[:6], 16)
+
+    # Map hash to hue (0-1)
+    # We want diversity but also biological plausibility
+    # Restrict to organic range: 0.05 (red-orange) to 0.65 (blue-green)
+    hue = 0.05 + (hash_int % 1000) / 1000.0 * 0.6
+
+    # Saturation based on genome complexity (number of genes)
+    # More genes = more saturated (specialized)
+    sat = 0.4 + min(0.5, num_genes * 0.1)
+
+    # Value (brightness) based on average yield
+    val = 0.6 + min(0.3, avg_yield * 0.06)
+
+    r, g, b = colorsys.hsv_to_rgb(hue, sat, val)
+    return (int(r*255), int(g*255), int(b*255))
+
+
+def _signature_text(signature):
+    """
+    Spells out a signature tuple as the string that seeds its color hash.
+
+    Molecule bitsets become sorted name lists, e.g. "2-3|in:A,C|out:B,C|cost:low|yield:med".
+    """
+    gene_bucket, inputs, outputs, cost_bucket, yield_bucket = signature
+    input_sig = ",".join(sorted(chem.get_name(mol) for mol in chem.iter_bits(inputs))) or "none"
+    output_sig = ",".join(sorted(chem.get_name(mol) for mol in chem.iter_bits(outputs))) or "none"
+    return f"{gene_bucket}|in:{input_sig}|out:{output_sig}|cost:{cost_bucket}|yield:{yield_bucket}"
+
+
 class WorldObject:
     """
     Handles the visual representation and update loop of the game world.
     It bridges the simulation logic (World) with the rendering engine (Pygame).
     """
+    # Paints its whole screen area and can repaint just the UI panel (see Engine.run)
+    supports_dirty_rects = True
+
     def __init__(self, world, cell_size=10):
         """
         Initializes the WorldObject.
@@ -19,13 +78,33 @@ class WorldObject:
         self.cell_size = cell_size
         self.accumulator = 0.0
         self.step_time = 0.1  # Time in seconds between simulation steps
-        
+        # World.version the world image was last rendered at, the living rows
+        # it was rendered from, and the screen it was last shown on
+        self._rendered_at = None
+        self._living = None
+        self._shown_on = None
+
         # Init font
         pygame.font.init()
         self.font = pygame.font.SysFont("Arial", 14)
+        # Pre-filled UI panel background, built on first draw for the screen width
+        self._ui_panel = None
+        # UI lines often repeat from frame to frame: rasterize each one once
+        self._render_text = functools.lru_cache(maxsize=512)(self._rasterize_text)
 
         # Pre-calculated background color
         self.bg_color = (20, 40, 60) # Deep Ocean Blue
+        self._bg_rgb = np.array(self.bg_color, dtype=np.uint8)
+
+        # Frame buffers, reused every frame: total concentration and color
+        # accumulators per tile, the world image (heatmap and cells) at one
+        # pixel per tile, and the same scaled to screen pixels
+        self._heatmap_total = np.zeros((world.cols, world.rows), dtype=np.float32)
+        self._heatmap_mixed = np.zeros((3, world.cols, world.rows), dtype=np.float32)
+        self._heatmap_term = np.zeros((world.cols, world.rows), dtype=np.float32)
+        self._heatmap_rgb = np.zeros((world.cols, world.rows, 3), dtype=np.uint8)
+        self._heatmap_tiles = pygame.Surface((world.cols, world.rows))
+        self._heatmap_scaled = pygame.Surface((world.cols * cell_size, world.rows * cell_size))
 
         # Chemical Colors Configuration
         self.chem_colors = {
@@ -33,6 +112,10 @@ class WorldObject:
             "B": (160, 82, 45),    # Brown/Rust (Waste)
             "C": (50, 205, 50),    # Emerald Green (Exotic Nutrient)
         }
+        # The same as a (MAX_MOLECULES, 3) table indexed by molecule id, Default Grey
+        self._chem_color_table = np.full((chem.MAX_MOLECULES, 3), 200, dtype=np.float32)
+        for mol_name, color in self.chem_colors.items():
+            self._chem_color_table[chem.get_value(mol_name)] = color
 
     def update(self, dt):
         """
@@ -47,47 +130,93 @@ class WorldObject:
             self.world.step()
             self.accumulator -= self.step_time
 
-    def draw(self, screen):
+    def draw(self, screen, partial=False):
         """
         Renders the world state to the screen.
-        
+
+        The heatmap and cells are only rendered again when World.version changed
+        since the last draw (steps, seeding, new cells; direct edits of the
+        world's arrays must call World.touch). Otherwise the cached world image
+        is reused. In partial mode, if that image is already on this screen,
+        just the UI panel is repainted.
+
         Args:
             screen (pygame.Surface): The target surface to draw onto.
+            partial (bool): Whether the screen still holds the previous frame,
+                so only the areas that changed need repainting.
+
+        Returns:
+            list or None: The rects that changed, or None if the whole screen was redrawn.
         """
-        # ---- Step 4: Draw Background ----
+        if self.world.version != self._rendered_at:
+            self._render_world()
+            self._rendered_at = self.world.version
+        elif partial and screen is self._shown_on:
+            return [self.draw_ui(screen, self._living)]
+        self._shown_on = screen
+
+        # Background, the cached world image, then the UI panel below it
         screen.fill(self.bg_color)
+        screen.blit(self._heatmap_scaled, (0, 0))
+        self.draw_ui(screen, self._living)
 
-        # ---- Step 5: Draw Chemicals (Dynamic Mixing) ----
-        # Iterate over all chemicals present in the world
-        
-        # We need to blend colors.
-        # Strategy:
-        # 1. Identify active tiles (optimize by union of indices > threshold? or just iterate non-empty arrays)
-        # 2. Accumulate weighted colors.
-        
-        # For performance with 3+ chemicals, finding the union of all non-zero indices is tricky efficiently.
-        # Let's iterate over ALL grid cells? No, too slow (80x60=4800 is fine, but if 800x600=480,000 is slow).
-        # Existing logic used argwhere.
-        
-        # New approach: 
-        # Create a "Total Concentration" grid and a "Accumulated Color" grid.
-        
-        # Using numpy for speed:
-        total_conc = np.zeros((self.world.cols, self.world.rows))
-        mixed_r = np.zeros((self.world.cols, self.world.rows))
-        mixed_g = np.zeros((self.world.cols, self.world.rows))
-        mixed_b = np.zeros((self.world.cols, self.world.rows))
-        
-        has_chemicals = False
+    def _render_world(self):
+        """
+        Renders the heatmap and cells into the cached, screen-sized world image.
+        """
+        # Chemicals: the mixed heatmap as one (cols, rows, 3) image, one pixel per tile
+        rgb = self._heatmap_rgb
+        if not self._composite_heatmap():
+            rgb[...] = self._bg_rgb
+
+        # Cells: they fill whole tiles, so they are painted as pixels of the same image.
+        # Living rows and positions come straight from the pool arrays
+        # (cells[i] owns row i); later cells on a shared tile paint over earlier ones
+        pool = self.world.pool
+        living = np.flatnonzero(pool.alive[:pool.size])
+        if len(living):
+            colors = self._cell_colors(living)
+            xs, ys = pool.x[living], pool.y[living]
+            inside = (xs >= 0) & (xs < self.world.cols) & (ys >= 0) & (ys < self.world.rows)
+            rgb[xs[inside], ys[inside]] = colors[inside]
+
+        # Scaling: blitted to a one pixel per tile surface and scaled up in one call
+        pygame.surfarray.blit_array(self._heatmap_tiles, rgb)
+        pygame.transform.scale(self._heatmap_tiles, self._heatmap_scaled.get_size(), self._heatmap_scaled)
+        self._living = living
+
+    def _composite_heatmap(self):
+        """
+        Mixes the chemical grids into the one pixel per tile heatmap image.
+
+        With Numba (and a float32 world) the whole mix is one fused kernel
+        pass; otherwise it runs as NumPy operations in preallocated buffers.
+
+        Returns:
+            bool: False if no chemical is present (the image is left untouched).
+        """
+        # Skip empty grids (optimization), one reduction over the whole stack
+        stack = self.world.chem_stack
+        if not len(stack):
+            return False
+        layers = np.flatnonzero(stack.max(axis=(1, 2)) >= 0.01)
+        if not len(layers):
+            return False
+        colors = self._chem_color_table[self.world.chem_ids[layers]]
+
+        if heatmap_kernel is not None and stack.dtype == np.float32:
+            heatmap_kernel(stack, layers, colors, self._bg_rgb, self._heatmap_rgb)
+            return True
+
+        # NumPy fallback, in preallocated buffers
+        total_conc = self._heatmap_total
+        mixed = self._heatmap_mixed
+        term = self._heatmap_term
+        total_conc.fill(0)
+        mixed.fill(0)
         
-        for mol_name, grid in self.world.chemistry.items():
-            # Skip if empty (optimization)
-            if np.max(grid) < 0.01: continue
-            
-            has_chemicals = True
-            
-            # Get color
-            base_color = self.chem_colors.get(mol_name, (200, 200, 200)) # Default Grey
+        for layer, base_color in zip(layers, colors):
+            grid = stack[layer]
             
             # Add to total
             total_conc += grid
@@ -95,60 +224,59 @@ class WorldObject:
             # Accumulate weighted color components
             # We weight purely by amount. 
             # R_acc += amount * R_base
-            mixed_r += grid * base_color[0]
-            mixed_g += grid * base_color[1]
-            mixed_b += grid * base_color[2]
-
-        if has_chemicals:
-            # Threshold to draw
-            # Get indices where total > 0.2 (Increased to hide low-level diffusion fog)
-            active_indices = np.argwhere(total_conc > 0.2)
-            
-            for x, y in active_indices:
-                t = total_conc[x, y]
-                
-                # Setup normalized color
-                # If t=10, r_acc = 10*R. r_final = r_acc / t = R. Correct.
-                # If t=10 (5 A, 5 B). r_acc = 5*Ra + 5*Rb. r_final = (5Ra+5Rb)/10 = 0.5Ra + 0.5Rb. Correct.
-                
-                r = mixed_r[x,y] / t
-                g = mixed_g[x,y] / t
-                b = mixed_b[x,y] / t
-                
-                # Intensity scaling (brightness/alpha) using t
-                # Standard: min(1.0, t / 20.0)
-                intensity = min(1.0, t / 20.0)
-                
-                # Apply intensity (Dim if low concentration)
-                # Formula: Color * (0.2 + 0.8 * intensity)
-                factor = 0.2 + 0.8 * intensity
-                
-                draw_r = int(min(255, r * factor))
-                draw_g = int(min(255, g * factor))
-                draw_b = int(min(255, b * factor))
-                
-                pygame.draw.rect(screen, (draw_r, draw_g, draw_b), 
-                                 (x*self.cell_size, y*self.cell_size, self.cell_size, self.cell_size))
-
-
-        # ---- Step 6: Draw Cells (Organic) ----
-        for cell in self.world.cells:
-            if not cell.alive:
-                continue
-
-            color = self.get_cell_color(cell)
-            
-            # Draw cell
-            rect = pygame.Rect(
-                cell.x * self.cell_size,
-                cell.y * self.cell_size,
-                self.cell_size,
-                self.cell_size
-            )
-            pygame.draw.rect(screen, color, rect)
-            
-        # ---- Step 7: UI ----
-        self.draw_ui(screen)
+            for channel in range(3):
+                np.multiply(grid, base_color[channel], out=term)
+                mixed[channel] += term
+
+        # Threshold to draw
+        # Tiles where total > 0.2 (Increased to hide low-level diffusion fog)
+        active = total_conc > 0.2
+        t = np.where(active, total_conc, 1)
+
+        # Normalized color
+        # If t=10, r_acc = 10*R. r_final = r_acc / t = R. Correct.
+        # If t=10 (5 A, 5 B). r_acc = 5*Ra + 5*Rb. r_final = (5Ra+5Rb)/10 = 0.5Ra + 0.5Rb. Correct.
+
+        # Intensity scaling (brightness/alpha) using t
+        # Standard: min(1.0, t / 20.0)
+        intensity = np.minimum(1.0, t / 20.0)
+
+        # Apply intensity (Dim if low concentration)
+        # Formula: Color * (0.2 + 0.8 * intensity)
+        factor = 0.2 + 0.8 * intensity
+
+        # Whole heatmap as one (cols, rows, 3) image, background where inactive
+        rgb = self._heatmap_rgb
+        for channel in range(3):
+            color = mixed[channel]
+            np.divide(color, t, out=color)
+            color *= factor
+            np.minimum(255, color, out=color)
+            rgb[:, :, channel] = color
+        rgb[~active] = self.bg_color
+        return True
+
+    def _cell_colors(self, living):
+        """
+        Gathers the colors of many cells as one uint8 array.
+
+        Reads the cached Genoma.display_color of every cell directly and only
+        calls get_cell_color for genomes that have not been colored yet.
+
+        Args:
+            living (np.ndarray): Pool rows of the cells.
+
+        Returns:
+            np.ndarray: uint8 array (len(living), 3) of RGB colors.
+        """
+        cells = self.world.cells
+        if len(living) != len(cells):
+            cells = [cells[i] for i in living.tolist()]
+        colors = [cell.genoma.display_color for cell in cells]
+        if None in colors:
+            colors = [color or self.get_cell_color(cell) for cell, color in zip(cells, colors)]
+        return np.fromiter(itertools.chain.from_iterable(colors), dtype=np.uint8,
+                           count=3 * len(colors)).reshape(-1, 3)
 
     def get_cell_color(self, cell):
         """
@@ -160,40 +288,29 @@ class WorldObject:
         - Metabolic profile (cost/yield ranges, not exact values)
         
         This allows tracking evolutionary lineages without rainbow chaos.
+
+        The color only depends on the genes, so it is computed once per genome
+        and cached in Genoma.display_color (reset when the genome mutates).
         """
-        genes = cell.genoma.genes
+        genoma = cell.genoma
+        if genoma.display_color is None:
+            genoma.display_color = self._genome_color(genoma)
+        return genoma.display_color
+
+    def _genome_color(self, genoma):
+        """Computes the color of a genome from its functional signature (see get_cell_color)."""
+        genes = genoma.genes
         if not genes:
             return (200, 200, 200)  # Dead/Empty gray
 
         # 1. Extract functional signature (stable across small mutations)
-        signature = self._get_genome_signature(genes)
-        
-        # 2. Convert signature to deterministic color
-        import hashlib
-        sig_hash = hashlib.md5(signature.encode()).hexdigest()
-        
-        # Use first 6 hex chars for color (like web colors)
-        # Convert to HSV for better control
-        hash_int = int(sig_hash[:6], 16)
-        
-        # Map hash to hue (0-1)
-        # We want diversity but also biological plausibility
-        # Restrict to organic range: 0.05 (red-orange) to 0.65 (blue-green)
-        hue = 0.05 + (hash_int % 1000) / 1000.0 * 0.6
-        
-        # Saturation based on genome complexity (number of genes)
-        # More genes = more saturated (specialized)
-        num_genes = len(genes)
-        sat = 0.4 + min(0.5, num_genes * 0.1)
-        
-        # Value (brightness) based on average yield
+        signature = self._get_genome_signature(genoma)
         avg_yield = sum(g.energy_yield for g in genes) / len(genes)
-        val = 0.6 + min(0.3, avg_yield * 0.06)
-        
-        r, g, b = colorsys.hsv_to_rgb(hue, sat, val)
-        return (int(r*255), int(g*255), int(b*255))
-    
-    def _get_genome_signature(self, genes):
+
+        # 2. Convert signature to deterministic color
+        return _signature_color(signature, len(genes), avg_yield)
+
+    def _get_genome_signature(self, genoma):
         """
         Creates a fuzzy functional signature of the genome.
         
@@ -202,7 +319,12 @@ class WorldObject:
         - Input chemistry types
         - Output chemistry types  
         - Metabolic profile (cost/yield ranges)
+
+        The signature is a small tuple of buckets and molecule bitsets, a cheap
+        cache key; _signature_text spells it out for hashing.
         """
+        genes = genoma.genes
+
         # 1. Gene count bucket (1, 2-3, 4-5, 6+)
         num_genes = len(genes)
         if num_genes == 1:
@@ -214,15 +336,9 @@ class WorldObject:
         else:
             gene_bucket = "6+"
         
-        # 2. Collect all input/output molecule types (sorted for consistency)
-        inputs = set()
-        outputs = set()
-        for gene in genes:
-            inputs.update(gene.input.keys())
-            outputs.update(gene.output.keys())
-        
-        input_sig = ",".join(sorted(inputs)) if inputs else "none"
-        output_sig = ",".join(sorted(outputs)) if outputs else "none"
+        # 2. All input/output molecule types, precomputed by the genome as bitsets
+        inputs = genoma.needed_bits
+        outputs = genoma.produced_bits
         
         # 3. Metabolic profile (bucketed averages)
         avg_cost = sum(g.cost for g in genes) / len(genes)
@@ -244,39 +360,75 @@ class WorldObject:
         else:
             yield_bucket = "high"
         
-        # Combine into signature string
-        signature = f"{gene_bucket}|in:{input_sig}|out:{output_sig}|cost:{cost_bucket}|yield:{yield_bucket}"
-        return signature
+        # Combine into signature
+        return (gene_bucket, inputs, outputs, cost_bucket, yield_bucket)
+
+
+    def _rasterize_text(self, text, color):
+        """
+        Renders one antialiased UI line (memoized per text and color by `_render_text`).
+
+        Args:
+            text (str): The line to render.
+            color (tuple): RGB text color.
 
+        Returns:
+            pygame.Surface: The rendered text, converted to the display format if there is one.
+        """
+        surface = self.font.render(text, True, color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def draw_ui(self, screen, living=None):
+        """
+        Draws the stats panel below the world.
 
-    def draw_ui(self, screen):
+        Args:
+            screen (pygame.Surface): The target surface to draw onto.
+            living (np.ndarray, optional): Pool rows of the living cells, as
+                already computed by draw(). Computed here if omitted.
+
+        Returns:
+            pygame.Rect: The screen area covered by the panel.
+        """
         # Draw background panel
         ui_y = self.world.rows * self.cell_size
-        ui_rect = pygame.Rect(0, ui_y, screen.get_width(), 100)
-        pygame.draw.rect(screen, (10, 20, 30), ui_rect)
+        if self._ui_panel is None or self._ui_panel.get_width() != screen.get_width():
+            self._ui_panel = pygame.Surface((screen.get_width(), 100))
+            self._ui_panel.fill((10, 20, 30))
+            if pygame.display.get_surface() is not None:
+                self._ui_panel = self._ui_panel.convert()
+        panel_rect = screen.blit(self._ui_panel, (0, ui_y))
         
         # Calculate stats
-        alive_cells = [c for c in self.world.cells if c.alive]
-        count = len(alive_cells)
+        if living is None:
+            pool = self.world.pool
+            living = np.flatnonzero(pool.alive[:pool.size])
+        count = len(living)
         
         # Line 1: Summary
         summary_str = f"Alive Cells: {count} | Total Cells: {len(self.world.cells)}"
-        summary_text = self.font.render(summary_str, True, (200, 220, 255))
+        summary_text = self._render_text(summary_str, (200, 220, 255))
         screen.blit(summary_text, (10, ui_y + 10))
         
         # Line 2+: Detail of first few live cells
         y_offset = 30
-        for i, cell in enumerate(alive_cells[:3]): 
+        for i, row in enumerate(living[:3].tolist()):
+            cell = self.world.cells[row]
             # Division status safe access
             div_status = "YES" if getattr(cell, 'ready_to_divide', False) else "NO"
             
             # Format chemistry for display (rounded to 1 decimal)
-            chem_str = ", ".join([f"{mol}:{amt:.1f}" for mol, amt in list(cell.chemistry.items())[:3]])
-            if len(cell.chemistry) > 3:
+            present = cell.chemistry.nonzero()[0]
+            chem_str = ", ".join([f"{chem.get_name(mol)}:{cell.chemistry[mol]:.1f}" for mol in present[:3]])
+            if len(present) > 3:
                 chem_str += "..."
             
             # Simple stats for UI
             info = f"Cell #{i}: E={cell.energy:.1f} | Age={cell.age} | ID={cell.genoma.get_hash()} | Chem=[{chem_str}]"
-            detail_text = self.font.render(info, True, (150, 180, 200))
+            detail_text = self._render_text(info, (150, 180, 200))
             screen.blit(detail_text, (20, ui_y + y_offset))
-            y_offset += 20
\ No newline at end of file
+            y_offset += 20
+
+        return panel_rect
@@ -10,8 +10,9 @@ Together they form a closed loop where waste from one is food for the other!
 
 from engine.core import Engine
 from render.world_object import WorldObject
+from biology import chemistry_dict as chem
 from biology.cell import Cell
-from biology.gen import Gen
+from biology.gen import gen_for
 from biology.genoma import Genoma
 from biology.world import World
 
@@ -32,7 +33,7 @@ if __name__ == "__main__":
     # Produces: B, C (as waste)
     # Energy: High yield
     
-    gen_producer = Gen(
+    gen_producer = gen_for(
         input={"A": 1},
         output={"B": 0.5, "C": 0.5},  # Produces B and C
         cost=0.2,
@@ -44,7 +45,7 @@ if __name__ == "__main__":
     
     # Verify waste
     cell_test = Cell(genoma_producer)
-    print(f"Producer waste: {cell_test._identify_waste()}")  # Should be {B, C}
+    print(f"Producer waste: {sorted(chem.get_name(m) for m in cell_test._identify_waste())}")  # Should be ['B', 'C']
     
     # ========================================
     # SPECIES 2: "RECYCLER" (Different color)
@@ -53,7 +54,7 @@ if __name__ == "__main__":
     # Produces: A (as waste, which feeds Producer!)
     # Energy: Medium yield
     
-    gen_recycler_b = Gen(
+    gen_recycler_b = gen_for(
         input={"B": 1},
         output={"A": 0.6},  # Converts B back to A
         cost=0.25,
@@ -61,7 +62,7 @@ if __name__ == "__main__":
         energy_yield=1.5
     )
     
-    gen_recycler_c = Gen(
+    gen_recycler_c = gen_for(
         input={"C": 1},
         output={"A": 0.6},  # Converts C back to A
         cost=0.25,
@@ -70,7 +71,7 @@ if __name__ == "__main__":
     )
     
     # High tolerance to B and C since they eat it
-    gen_tolerance = Gen(
+    gen_tolerance = gen_for(
         input={},
         output={},
         cost=0,
@@ -83,7 +84,7 @@ if __name__ == "__main__":
     
     # Verify waste
     cell_test2 = Cell(genoma_recycler)
-    print(f"Recycler waste: {cell_test2._identify_waste()}")  # Should be {A}
+    print(f"Recycler waste: {sorted(chem.get_name(m) for m in cell_test2._identify_waste())}")  # Should be ['A']
     
     print("\n🔄 CLOSED LOOP DETECTED!")
     print("Producer: A → B,C (waste)")
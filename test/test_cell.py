@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from biology import chemistry_dict as chem
+from biology.action import CellAction
+from biology import cell as cell_module
+from biology.cell import Cell
+from biology.gen import Gen
+from biology.genoma import Genoma
+
+
+def test_decide_exchange_releases_waste_and_excess():
+    A, B, C = chem.get_value('A'), chem.get_value('B'), chem.get_value('C')
+    genoma = Genoma([Gen({'A': 1}, {'B': 1}, cost=0.1, prob=1.0)])
+    cell = Cell(genoma)
+    chemistry = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    chemistry[A] = 4.0   # needed, below tolerance: kept
+    chemistry[B] = 1.5   # waste: released entirely
+    chemistry[C] = 12.0  # above the default tolerance (10): excess over 8 released
+    cell.chemistry = chemistry
+
+    env = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    env[A] = 2.0
+    actions = cell.decide_exchange(env)
+
+    absorbs = {a.molecule: a.amount for a in actions if a.type == CellAction.ABSORB}
+    releases = {a.molecule: a.amount for a in actions if a.type == CellAction.RELEASE}
+    assert absorbs == {A: pytest.approx(1.0)}
+    assert releases == {B: pytest.approx(1.5), C: pytest.approx(4.0)}
+
+
+def test_python_metabolism_skips_blocked_genes(monkeypatch):
+    monkeypatch.setattr(cell_module, "metabolize_kernel", None)
+    A, B, C = chem.get_value('A'), chem.get_value('B'), chem.get_value('C')
+    genoma = Genoma([
+        Gen({'C': 1}, {}, cost=0.5, prob=1.0, energy_yield=5),   # C absent and never produced
+        Gen({'A': 1}, {'B': 1}, cost=0.2, prob=1.0, energy_yield=1),
+        Gen({'B': 1}, {}, cost=0.1, prob=1.0, energy_yield=1),   # B absent but produced above
+    ])
+    cell = Cell(genoma)
+    cell.chemistry[A] = 1.0
+    cell.energy = 1.0
+
+    cell._metabolize()
+
+    assert genoma.genes[0].required_bits & genoma.needed_bits & ~genoma.produced_bits
+    assert cell.energy == pytest.approx(1.0 + 0.8 + 0.9)
+    assert cell.chemistry[A] == cell.chemistry[B] == cell.chemistry[C] == 0
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_metabolism_runs_genes_with_zero_input_amounts(monkeypatch, compiled):
+    if not compiled:
+        monkeypatch.setattr(cell_module, "metabolize_kernel", None)
+    elif cell_module.metabolize_kernel is None:
+        pytest.skip("numba not installed")
+    C = chem.get_value('C')
+    # 'A' is needed in a zero amount: Gen.can_react accepts empty chemistry
+    genoma = Genoma([Gen({'A': 0}, {'C': 1}, cost=0.5, prob=1.0, energy_yield=2)])
+    cell = Cell(genoma)
+    cell.energy = 1.0
+
+    cell._metabolize()
+
+    assert cell.energy == pytest.approx(1.0 + 1.5)
+    assert cell.chemistry[C] == 1
+
+
+def test_movement_picks_first_best_neighbor():
+    A = chem.get_value('A')
+    cell = Cell(Genoma([Gen({'A': 1}, {}, cost=0.1, prob=1.0)]))
+    cell.energy = 5.0
+    env = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    env[A] = 0.2
+    neighbors = np.zeros((4, chem.MAX_MOLECULES), dtype=np.float32)
+    neighbors[[1, 2], A] = 0.4  # S and E tie
+
+    move = cell._decide_movement(env, neighbors, wander=(1.0, 0))
+    assert (move.type, move.dx, move.dy, move.cost) == (CellAction.MOVE, 0, 1, 0.5)
+
+    neighbors[:, A] = 0.205  # less than 5% better: stay
+    assert cell._decide_movement(env, neighbors, wander=(1.0, 0)) is None
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_decide_actions_is_reproducible_with_a_seeded_rng(monkeypatch, compiled):
+    if not compiled:
+        monkeypatch.setattr(cell_module, "metabolize_kernel", None)
+    elif cell_module.metabolize_kernel is None:
+        pytest.skip("numba not installed")
+    A = chem.get_value('A')
+    genoma = Genoma([Gen({'A': 1}, {'B': 1}, cost=0.1, prob=0.5, energy_yield=1)] * 4)
+    env = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    neighbors = np.zeros((4, chem.MAX_MOLECULES), dtype=np.float32)
+
+    outcomes = []
+    for _ in range(2):
+        rng = np.random.default_rng(7)
+        cell = Cell(genoma)
+        cell.chemistry[A] = 10.0
+        cell.energy = 5.0
+        moves = []
+        for _ in range(20):
+            actions = cell.decide_actions(env, neighbors, rng=rng)
+            moves.append([(a.dx, a.dy) for a in actions if a.type == CellAction.MOVE])
+        outcomes.append((cell.energy, cell.chemistry.copy(), moves))
+
+    assert outcomes[0][0] == outcomes[1][0]
+    np.testing.assert_array_equal(outcomes[0][1], outcomes[1][1])
+    assert outcomes[0][2] == outcomes[1][2]
@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+from biology import chemistry_dict as chem
+from biology.cell import Cell
+from biology.cell_pool import CellPool
+from biology.gen import Gen
+from biology.genoma import Genoma
+from biology.world import World
+
+
+def make_chemistry(**amounts):
+    chemistry = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    for mol, amount in amounts.items():
+        chemistry[chem.get_value(mol)] = amount
+    return chemistry
+
+
+def test_pool_step_matches_cell_step():
+    genoma = Genoma([Gen(input={'A': 1}, output={}, cost=0.1, prob=1.0, tolerance={'B': 100})])
+
+    pool = CellPool()
+    pooled = [Cell(genoma, pool) for _ in range(3)]
+    single = [Cell(genoma) for _ in range(3)]
+
+    for i, (a, b) in enumerate(zip(pooled, single)):
+        for cell in (a, b):
+            cell.chemistry = make_chemistry(A=2.0 * i, B=50.0, C=12.0)
+            cell.energy = 2.0 + 3.0 * i
+
+    pool.step()
+    for cell in single:
+        cell.step()
+
+    for a, b in zip(pooled, single):
+        assert a.energy == pytest.approx(b.energy)
+        assert a.alive == b.alive
+        assert a.ready_to_divide == b.ready_to_divide
+        assert a.age == b.age == 1
+
+
+def test_toxicity_uses_genome_tolerance():
+    genoma = Genoma([Gen(input={}, output={}, cost=0, prob=1.0, tolerance={'B': 100})])
+    cell = Cell(genoma)
+    cell.chemistry = make_chemistry(B=50.0, C=12.0)
+    cell.energy = 10.0
+
+    cell.assess_state()
+
+    # B is tolerated, C exceeds the default tolerance (10) by 2
+    assert cell.energy == pytest.approx(10.0 - 0.2 * 2)
+
+
+def test_compact_keeps_rows_in_order():
+    pool = CellPool(capacity=1)
+    rows = [pool.add(energy=e) for e in (1.0, 2.0, 3.0, 4.0)]
+
+    pool.compact([rows[3], rows[1]])
+
+    assert pool.size == 2
+    assert list(pool.energy[:pool.size]) == [4.0, 2.0]
+
+
+def test_compact_leaves_leading_rows_in_place():
+    pool = CellPool(capacity=1)
+    for e in (1.0, 2.0, 3.0, 4.0, 5.0):
+        pool.add(energy=e)
+
+    pool.compact([4, 3], start=2)
+
+    assert list(pool.energy[:pool.size]) == [1.0, 2.0, 5.0, 4.0]
+
+
+def test_pool_metabolize_matches_gen_reactions():
+    genomes = [
+        Genoma([Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=1.0, energy_yield=2),
+                Gen({'C': 1}, {}, cost=0.15, prob=1.0, energy_yield=1.2)]),
+        Genoma([Gen({'A': 2}, {'A': 1, 'C': 1}, cost=0.5, prob=1.0, energy_yield=1)]),
+        Genoma([Gen({'B': 1}, {}, cost=0.3, prob=1.0)]),
+    ]
+    pool = CellPool()
+    cells = [Cell(genoma, pool) for genoma in genomes]
+    for cell in cells:
+        cell.chemistry = make_chemistry(A=3.0, B=0.5)
+        cell.energy = 1.0
+
+    expected = []
+    for cell in cells:
+        chemistry, energy = cell.chemistry.copy(), cell.energy
+        for gen in cell.genoma.genes:
+            if gen.can_react(chemistry, energy):
+                energy = gen.reaction(chemistry, energy)
+        expected.append((chemistry, energy))
+
+    pool.metabolize()
+
+    for cell, (chemistry, energy) in zip(cells, expected):
+        assert cell.energy == pytest.approx(energy)
+        np.testing.assert_allclose(cell.chemistry, chemistry, rtol=1e-6)
+
+
+def test_simulation_arrays_stay_float32():
+    genoma = Genoma([Gen({'A': 1}, {'B': 0.5}, cost=0.2, prob=0.5, energy_yield=2)])
+    world = World(100, 100, cell_size=10)
+    world.seed_clusters('A', total_amount=500, num_clusters=2)
+    for i in range(4):
+        world.add_cell(Cell(genoma), 2 * i, 3)
+    for _ in range(5):
+        world.step()
+
+    for grid in world.chemistry.values():
+        assert grid.dtype == np.float32
+    for name in ("energy", "chem", "tolerance", "gene_in_amt", "gene_out_amt",
+                 "gene_cost", "gene_prob", "gene_yield"):
+        assert getattr(world.pool, name).dtype == np.float32, name
+    assert world.pool.total_chemistry().dtype == np.float32
+    for table in genoma.gene_table:
+        assert table.dtype in (np.float32, np.intp)
+
+
+def test_positions_live_in_pool_rows():
+    genoma = Genoma([Gen({'A': 1}, {}, cost=0.1, prob=1.0)])
+    world = World(100, 100, cell_size=10)
+    for i in range(3):
+        world.add_cell(Cell(genoma), i, 2 * i)
+
+    # Drop the first cell
+    world.pool.compact([1, 2])
+    for row, cell in enumerate(world.cells[1:]):
+        cell._row = row
+
+    assert world.pool.x[:2].tolist() == [1, 2]
+    assert world.pool.y[:2].tolist() == [2, 4]
+    assert (world.cells[2].x, world.cells[2].y) == (2, 4)
@@ -0,0 +1,19 @@
+import numpy as np
+from biology import chemistry_dict as chem
+
+
+def test_names_round_trip_and_unknown_ids():
+    value = chem.get_value('ROUND_TRIP')
+    assert chem.get_value('ROUND_TRIP') == value
+    assert chem.get_name(value) == 'ROUND_TRIP'
+    assert chem.get_name(chem.MAX_MOLECULES - 1) == 'UNK_FF'
+
+
+def test_bitsets():
+    mask = np.zeros(chem.MAX_MOLECULES, dtype=bool)
+    mask[[0, 63, 64, 255]] = True
+
+    bits = chem.mask_to_bits(mask)
+
+    assert bits == chem.ids_to_bits([255, 0, 64, 63])
+    assert list(chem.iter_bits(bits)) == [0, 63, 64, 255]
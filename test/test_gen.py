@@ -1,31 +1,90 @@
+import numpy as np
 import pytest
-from structures.gen import Gen
+from biology import chemistry_dict as chem
+from biology.gen import Gen, gen_for
 
-def test_gen_reaction():
-    # Define initial state
-    chemistry = {'A': 10, 'B': 5}
-    energy = 100
+@pytest.fixture
+def chemistry():
+    """A fresh chemistry vector with 10 'A' and 5 'B'."""
+    chemistry = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    chemistry[chem.get_value('A')] = 10
+    chemistry[chem.get_value('B')] = 5
+    return chemistry
+
+
+@pytest.fixture(scope="module")
+def a_to_c():
+    """
+    Shared gene: needs 2 'A', produces 1 'C', costs 10 energy and always
+    happens if possible. Tests must not mutate it.
+    """
+    return Gen(input={'A': 2}, output={'C': 1}, cost=10, prob=1.0)
 
-    # Define a gene
-    # Input: needs 2 'A'
-    # Output: produces 1 'C'
-    # Cost: 10 energy
-    # Probability: 1.0 (always happens if possible)
-    test_gen = Gen(input={'A': 2}, output={'C': 1}, cost=10, prob=1.0)
+
+def test_gen_reaction(chemistry, a_to_c):
+    A, B, C = chem.get_value('A'), chem.get_value('B'), chem.get_value('C')
+    energy = 100
 
     # Check if reaction is possible
-    can_react = test_gen.can_react(chemistry, energy)
-    assert can_react is True, "Reaction should be possible"
-
-    if can_react:
-        # Perform reaction
-        new_energy = test_gen.reaction(chemistry, energy)
-        
-        # Verify results
-        assert chemistry['A'] == 8
-        assert chemistry['B'] == 5
-        assert chemistry.get('C', 0) == 1
-        assert new_energy == 90
-    else:
-        pytest.fail("Reaction failed conditions unexpectedly")
-        
+    assert a_to_c.can_react(chemistry, energy) is True, "Reaction should be possible"
+
+    # Perform reaction
+    new_energy = a_to_c.reaction(chemistry, energy)
+
+    # Verify results
+    assert chemistry[A] == 8
+    assert chemistry[B] == 5
+    assert chemistry[C] == 1
+    assert new_energy == 90
+
+
+def test_gen_id_tracks_mutations():
+    gen = Gen(input={'A': 2}, output={'C': 1}, cost=10, prob=1.0)
+    same = Gen(input={'A': 2}, output={'C': 1}, cost=10, prob=0.5)
+    assert gen.get_id() == same.get_id()
+    assert hash(gen.get_id()) == hash(same.get_id())
+
+    costlier = gen.variant(cost=11)
+    assert costlier.get_id() != same.get_id()
+    assert "cost:11.0000" in costlier.get_id_str()
+    assert gen.cost == 10 and gen.get_id() == same.get_id()
+
+
+def test_built_genes_are_read_only():
+    gen = Gen(input={'A': 2}, output={'C': 1}, cost=10, prob=1.0, energy_yield=2)
+    for name in ("cost", "prob", "energy_yield"):
+        with pytest.raises(AttributeError):
+            setattr(gen, name, 0.5)
+    assert (gen.cost, gen.prob, gen.energy_yield) == (10, 1.0, 2)
+
+    clone = gen.clone()
+    with pytest.raises(AttributeError):
+        clone.cost = 11
+
+
+def test_gene_definition_is_copied_and_read_only():
+    inputs, tolerance = {'A': 2}, {'B': 50}
+    gen = Gen(input=inputs, output={'C': 1}, cost=10, prob=1.0, tolerance=tolerance)
+    first_id = gen.get_id()
+
+    inputs['A'] = 5
+    tolerance['B'] = 1
+    assert gen.input == {'A': 2} and gen.tolerance == {'B': 50}
+    with pytest.raises(TypeError):
+        gen.input['A'] = 5
+    with pytest.raises(TypeError):
+        gen.output['D'] = 1
+    with pytest.raises(AttributeError):
+        gen.tolerance = {}
+    assert gen.get_id() == first_id
+
+
+def test_genes_are_interned():
+    gen = gen_for({'A': 2}, {'C': 1}, cost=10, prob=1.0)
+    assert gen_for({'A': 2}, {'C': 1}, cost=10, prob=1.0) is gen
+
+    cheaper = gen.variant(cost=9)
+    assert cheaper is not gen and gen.cost == 10
+    assert gen.variant(cost=9) is cheaper
+    assert (cheaper.cost, cheaper.prob) == (9, 1.0)
+    assert cheaper.get_id() != gen.get_id()
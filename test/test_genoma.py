@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from biology import chemistry_dict as chem
+from biology.gen import Gen
+from biology.genoma import Genoma
+
+
+def test_genome_indexes():
+    A, B, C = chem.get_value('A'), chem.get_value('B'), chem.get_value('C')
+    gen_a = Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=1.0)
+    gen_c = Gen({'C': 1}, {}, cost=0.1, prob=1.0, tolerance={'B': 100})
+    gen_tol = Gen({}, {}, cost=0, prob=1.0, tolerance={'B': 50, 'C': 5})
+    genoma = Genoma([gen_a, gen_c, gen_tol])
+
+    assert sorted(genoma.needed_ids.tolist()) == sorted([A, C])
+    assert genoma.processable_mask[A] and genoma.processable_mask[C]
+    assert not genoma.processable_mask[B]
+
+    # B is produced and never consumed
+    assert genoma.waste_mask.nonzero()[0].tolist() == [B]
+    assert genoma.waste_ids.tolist() == [B]
+    assert genoma.needed_bits == chem.ids_to_bits([A, C])
+    assert genoma.produced_bits == chem.ids_to_bits([B, C])
+    assert gen_a.required_bits == chem.ids_to_bits([A])
+
+    assert genoma.tolerance_vec[B] == 100
+    assert genoma.tolerance_vec[C] == 5
+    assert genoma.tolerance_vec[A] == Genoma.DEFAULT_TOLERANCE
+
+
+def test_clone_is_independent():
+    gen_a = Gen({'A': 1}, {'B': 1}, cost=0.2, prob=1.0)
+    genoma = Genoma([gen_a, Gen({'B': 1}, {}, cost=0.1, prob=1.0)])
+
+    clone = genoma.clone()
+    assert clone.genes == genoma.genes and clone.genes is not genoma.genes
+    rand = np.ones(Genoma.mutation_draws(2))
+    rand[4:6] = (0.0, 1.0)                # first gene: cost +0.1
+    clone.mutate(rand=rand)
+
+    assert gen_a.cost == 0.2 and genoma.genes[0] is gen_a
+    assert clone.genes[0].cost == pytest.approx(0.3)
+    assert clone.genes[1] is genoma.genes[1]
+    assert clone.get_hash() != genoma.get_hash()
+    assert clone.gene_table[6][0] == pytest.approx(0.3)
+    assert genoma.gene_table[6][0] == pytest.approx(0.2)
+
+
+def test_mutate_with_predrawn_randomness():
+    original = Gen({'A': 1}, {'B': 1}, cost=0.5, prob=0.5)
+    genoma = Genoma([original, Gen({'B': 1}, {}, cost=0.3, prob=0.9)])
+    rand = np.ones(Genoma.mutation_draws(2))
+    rand[:2] = (0.0, 0.75)                # duplicate the second gene
+    rand[4:8] = (0.0, 1.0, 0.0, 0.0)      # first gene: cost +0.1, prob -0.1
+
+    genoma.mutate(rand=rand)
+
+    assert len(genoma.genes) == 3
+    assert genoma.genes[0].cost == pytest.approx(0.6)
+    assert genoma.genes[0].prob == pytest.approx(0.4)
+    assert (original.cost, original.prob) == (0.5, 0.5)
+    # Genes are flyweights: the duplicate shares the instance
+    assert genoma.genes[2] is genoma.genes[1]
+
+
+def test_hash_is_cached_until_genes_change():
+    genoma = Genoma([Gen({'A': 1}, {'B': 1}, cost=0.5, prob=0.5)])
+    first = genoma.get_hash()
+    assert genoma.get_hash() is first
+
+    original = genoma.genes[0]
+    genoma.genes[0] = original.variant(cost=0.6)
+    assert genoma.get_hash() != first
+    assert original.cost == 0.5
+    genoma.genes[0] = original
+    assert genoma.get_hash() == first
+
+
+def test_display_color_is_reset_by_mutation():
+    genoma = Genoma([Gen({'A': 1}, {'B': 1}, cost=0.5, prob=0.5)])
+    genoma.display_color = (1, 2, 3)
+    clone = genoma.clone()
+    assert clone.display_color == (1, 2, 3)
+
+    rand = np.ones(Genoma.mutation_draws(1))
+    rand[4:6] = (0.0, 1.0)                # cost +0.1
+    clone.mutate(rand=rand)
+
+    assert clone.display_color is None
+    assert genoma.display_color == (1, 2, 3)
+
+
+def test_mutate_without_changes_keeps_indexes():
+    genoma = Genoma([Gen({'A': 1}, {'B': 1}, cost=0.5, prob=0.5)])
+    genoma.display_color = (1, 2, 3)
+    clone = genoma.clone()
+
+    clone.mutate(rand=np.ones(Genoma.mutation_draws(1)))
+
+    assert clone.genes == genoma.genes
+    assert clone.gene_table is genoma.gene_table
+    assert clone.display_color == (1, 2, 3)
@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from biology import chemistry_dict as chem
+from biology import cell_pool, kernels
+from biology import world as world_module
+from biology.cell import Cell
+from biology.cell_pool import CellPool
+from biology.gen import Gen
+from biology.genoma import Genoma
+from biology.world import World
+
+
+@pytest.mark.skipif(kernels.metabolize_kernel is None, reason="numba not installed")
+def test_metabolize_kernel_matches_gen_reactions():
+    genoma = Genoma([
+        Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=1.0, energy_yield=2),
+        Gen({'C': 1}, {}, cost=0.15, prob=1.0, energy_yield=1.2),
+        Gen({'B': 1}, {}, cost=0.3, prob=1.0),
+    ])
+    chemistry = np.zeros(chem.MAX_MOLECULES, dtype=np.float32)
+    chemistry[chem.get_value('A')] = 3
+    chemistry[chem.get_value('C')] = 0.5
+
+    expected_chem = chemistry.copy()
+    expected_energy = 10.0
+    for gen in genoma.genes:
+        if gen.can_react(expected_chem, expected_energy):
+            expected_energy = gen.reaction(expected_chem, expected_energy)
+
+    rand_u = np.zeros(len(genoma.genes))
+    energy = kernels.metabolize_kernel(chemistry, 10.0, *genoma.gene_table, rand_u)
+
+    assert energy == pytest.approx(expected_energy)
+    np.testing.assert_allclose(chemistry, expected_chem)
+
+
+def _populated_pool():
+    genomes = [
+        Genoma([Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=0.7, energy_yield=2),
+                Gen({'C': 1}, {}, cost=0.15, prob=1.0, energy_yield=1.2, tolerance={'B': 100})]),
+        Genoma([Gen({'A': 2}, {'A': 1, 'C': 1}, cost=0.5, prob=0.5, energy_yield=1)]),
+    ]
+    rng = np.random.default_rng(0)
+    pool = CellPool()
+    for i in range(40):
+        genoma = genomes[i % 2]
+        row = pool.add(energy=rng.uniform(-1, 12), tolerance=genoma.tolerance_vec, genes=genoma.gene_table)
+        pool.chem[row, [chem.get_value(m) for m in 'ABC']] = rng.uniform(0, 15, 3)
+        pool.cooldown[row] = rng.integers(0, 2)
+        pool.age[row] = rng.integers(0, 100)
+    pool.alive[:5] = False
+    return pool
+
+
+@pytest.mark.skipif(kernels.step_pool_kernel is None, reason="numba not installed")
+def test_step_pool_kernel_matches_numpy_step():
+    compiled, reference = _populated_pool(), _populated_pool()
+
+    compiled.step()
+    reference.step(np.arange(reference.size))
+
+    # Only the summation order differs: outcomes must match exactly
+    for name in ("age", "alive", "cooldown", "ready"):
+        np.testing.assert_array_equal(getattr(compiled, name), getattr(reference, name), err_msg=name)
+    np.testing.assert_allclose(compiled.energy, reference.energy, rtol=1e-6)
+
+
+@pytest.mark.skipif(kernels.metabolize_pool_kernel is None, reason="numba not installed")
+def test_metabolize_pool_kernel_matches_numpy_metabolize(monkeypatch):
+    compiled, reference = _populated_pool(), _populated_pool()
+    rand = np.random.default_rng(1).random((np.count_nonzero(compiled.alive), compiled.gene_cost.shape[1]))
+
+    compiled.metabolize(rand)
+    monkeypatch.setattr(cell_pool, "metabolize_pool_kernel", None)
+    reference.metabolize(rand)
+
+    np.testing.assert_allclose(compiled.energy, reference.energy, rtol=1e-5)
+    np.testing.assert_allclose(compiled.chem, reference.chem, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.skipif(kernels.diffuse_kernel is None, reason="numba not installed")
+def test_diffuse_kernel_matches_numpy_diffuse(monkeypatch):
+    compiled, reference = World(70, 50, cell_size=10), World(70, 50, cell_size=10)
+    rng = np.random.default_rng(2)
+    for world in (compiled, reference):
+        world.seed('A', 0)
+        world.seed('B', 0)
+    compiled.chem_stack[...] = rng.uniform(0, 5, compiled.chem_stack.shape)
+    reference.chem_stack[...] = compiled.chem_stack
+
+    compiled.diffuse(0.1)
+    monkeypatch.setattr(world_module, "diffuse_kernel", None)
+    reference.diffuse(0.1)
+
+    np.testing.assert_array_equal(compiled.chem_stack, reference.chem_stack)
+    assert np.shares_memory(compiled.chemistry['B'], compiled.chem_stack)
+
+
+def _exchanging_world():
+    genomes = [
+        Genoma([Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=0.7, energy_yield=2)]),
+        Genoma([Gen({'B': 1}, {'D': 1}, cost=0.5, prob=0.5, energy_yield=1, tolerance={'C': 2})]),
+    ]
+    rng = np.random.default_rng(3)
+    world = World(50, 50, cell_size=10)
+    world.seed('A', 0)
+    world.seed('B', 0)
+    world.chem_stack[...] = rng.uniform(0, 3, world.chem_stack.shape)
+    for i in range(60):
+        cell = Cell(genomes[i % 2])
+        world.add_cell(cell, *rng.integers(0, 5, 2))
+        cell.energy = rng.uniform(-0.01, 0.05)
+        world.pool.chem[cell._row, [chem.get_value(m) for m in 'ABCD']] = rng.uniform(0, 6, 4)
+    return world
+
+
+@pytest.mark.skipif(kernels.exchange_kernel is None, reason="numba not installed")
+def test_exchange_kernels_match_numpy_exchange(monkeypatch):
+    compiled, reference = _exchanging_world(), _exchanging_world()
+
+    compiled.execute_exchange(compiled.plan_exchange(compiled.cells))
+    monkeypatch.setattr(world_module, "plan_exchange_kernel", None)
+    monkeypatch.setattr(world_module, "exchange_kernel", None)
+    reference.execute_exchange(reference.plan_exchange(reference.cells))
+
+    np.testing.assert_array_equal(compiled.pool.energy, reference.pool.energy)
+    np.testing.assert_array_equal(compiled.pool.chem, reference.pool.chem)
+    for name, grid in reference.chemistry.items():
+        np.testing.assert_array_equal(compiled.chemistry[name], grid)
+
+
+@pytest.mark.skipif(kernels.heatmap_kernel is None, reason="numba not installed")
+def test_heatmap_kernel_matches_numpy_compositing(monkeypatch):
+    world_object = pytest.importorskip("render.world_object")
+    world = World(300, 200, cell_size=10)
+    rng = np.random.default_rng(4)
+    for mol in 'ABC':
+        world.seed(mol, 0)
+    world.chem_stack[...] = rng.uniform(0, 30, world.chem_stack.shape) * (rng.random(world.chem_stack.shape) < 0.3)
+    world.chemistry['C'][...] = 0.005     # below the drawing cutoff
+    view = world_object.WorldObject(world)
+
+    assert view._composite_heatmap()
+    compiled = view._heatmap_rgb.copy()
+    monkeypatch.setattr(world_object, "heatmap_kernel", None)
+    view._heatmap_rgb[...] = 0
+    assert view._composite_heatmap()
+
+    np.testing.assert_array_equal(compiled, view._heatmap_rgb)
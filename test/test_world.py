@@ -0,0 +1,142 @@
+import numpy as np
+from biology import chemistry_dict as chem
+from biology.cell import Cell
+from biology.gen import Gen
+from biology.genoma import Genoma
+from biology.world import World
+
+
+def make_world():
+    genomes = [
+        Genoma([Gen({'A': 1}, {'B': 0.2, 'C': 0.8}, cost=0.2, prob=1.0, energy_yield=2)]),
+        Genoma([Gen({'A': 1, 'C': 1}, {}, cost=0.1, prob=1.0)]),
+    ]
+    world = World(50, 50, cell_size=10)
+    world.seed('A', 4.0)
+    world.seed('C', 2.0)
+    positions = [(0, 0), (0, 0), (0, 0), (1, 2), (3, 3), (3, 3)]
+    for i, (x, y) in enumerate(positions):
+        cell = Cell(genomes[i % 2])
+        cell.energy = 0.015 if i == 1 else 5.0  # cell 1 can only afford part of its absorption
+        cell.chemistry[chem.get_value('B')] = 1.5
+        cell.chemistry[chem.get_value('C')] = 12.0 * (i % 3 == 0)
+        world.add_cell(cell, x, y)
+    return world
+
+
+def test_batched_exchange_matches_per_cell_actions():
+    batched, reference = make_world(), make_world()
+
+    batched.execute_exchange(batched.plan_exchange(batched.cells))
+    reference.execute_actions({
+        cell: cell.decide_exchange(reference.get_local_chemistry(*reference.cell_tile(cell)))
+        for cell in reference.cells
+    })
+
+    n = reference.pool.size
+    np.testing.assert_array_equal(batched.pool.energy[:n], reference.pool.energy[:n])
+    np.testing.assert_array_equal(batched.pool.chem[:n], reference.pool.chem[:n])
+    assert batched.chemistry.keys() == reference.chemistry.keys()
+    for mol, grid in reference.chemistry.items():
+        np.testing.assert_array_equal(batched.chemistry[mol], grid)
+
+
+def test_diffuse_matches_rolled_stencil():
+    world = World(60, 40, cell_size=10)
+    rng = np.random.default_rng(0)
+    for mol in ('A', 'B'):
+        world.seed(mol, 0)
+        world.chemistry[mol][...] = rng.uniform(0, 5, (world.cols, world.rows))
+    expected = {}
+    for mol, grid in world.chemistry.items():
+        neighbor_sum = (np.roll(grid, 1, axis=0) + np.roll(grid, -1, axis=0) +
+                        np.roll(grid, 1, axis=1) + np.roll(grid, -1, axis=1))
+        expected[mol] = grid * (1 - 0.1) + (neighbor_sum * 0.1 / 4)
+
+    world.diffuse(0.1)
+
+    for mol, grid in expected.items():
+        np.testing.assert_allclose(world.chemistry[mol], grid, rtol=1e-6)
+        assert np.shares_memory(world.chemistry[mol], world.chem_stack)
+
+
+def test_batched_chemistry_matches_grid_lookups():
+    world = make_world()
+    A, C = chem.get_value('A'), chem.get_value('C')
+    world.chemistry['A'][...] = np.arange(world.cols * world.rows).reshape(world.cols, world.rows)
+    cx, cy = np.array([0, 2, 4]), np.array([0, 3, 4])
+
+    env = world.local_chemistry(cx, cy)
+    neighbors = world.neighbors_chemistry(cx, cy)
+
+    assert env.shape == (3, chem.MAX_MOLECULES)
+    np.testing.assert_array_equal(env[:, A], world.chemistry['A'][cx, cy])
+    assert (env[:, C] == 2.0).all()
+    # Tile (0, 0): N and W are out of bounds, S is (0, 1) and E is (1, 0)
+    assert neighbors[0, :, A].tolist() == [0, world.chemistry['A'][0, 1], world.chemistry['A'][1, 0], 0]
+    assert neighbors[1, 0, A] == world.chemistry['A'][2, 2]
+    np.testing.assert_array_equal(world.get_neighbors_chemistry(4, 4), neighbors[2])
+
+
+def test_seed_clusters_deposits_total_amount():
+    world = World(200, 100, cell_size=10, seed=0)
+
+    world.seed_clusters('A', total_amount=600, num_clusters=3)
+
+    grid = world.chemistry['A']
+    assert np.isclose(grid.sum(), 600, rtol=1e-5)
+    assert (grid >= 0).all() and np.count_nonzero(grid) > 3
+
+
+
+def test_seeded_worlds_are_reproducible():
+    def run(seed):
+        world = World(200, 100, cell_size=10, seed=seed)
+        world.seed_clusters('A', total_amount=600, num_clusters=3)
+        for i in range(4):
+            world.add_cell(Cell(Genoma([Gen({'A': 1}, {'B': 0.5}, cost=0.2, prob=0.5, energy_yield=2)])), 5 * i, 4)
+        for _ in range(30):
+            world.step()
+        return world
+
+    first, second = run(7), run(7)
+    assert len(first.cells) == len(second.cells)
+    np.testing.assert_array_equal(first.chem_stack, second.chem_stack)
+    np.testing.assert_array_equal(first.pool.energy, second.pool.energy)
+
+
+def test_float16_stack_diffuses_in_float32_and_promotes_when_full():
+    half, full = World(60, 40, cell_size=10, dtype=np.float16), World(60, 40, cell_size=10)
+    for world in (half, full):
+        world.seed('A', 3.0)
+        world.chemistry['A'][2, 2] = 50
+        world.diffuse(0.1)
+    assert half.chem_stack.dtype == np.float16
+    np.testing.assert_allclose(half.chemistry['A'], full.chemistry['A'], rtol=1e-3)
+
+    half.seed('B', 2 * World.FLOAT16_LIMIT)
+    assert half.chem_stack.dtype == np.float32
+    assert half.chemistry['B'][0, 0] == 2 * World.FLOAT16_LIMIT
+    assert np.shares_memory(half.chemistry['A'], half.chem_stack)
+
+
+def test_batched_moves_match_per_cell_decisions():
+    world = make_world()
+    rng = np.random.default_rng(3)
+    world.chemistry['A'][...] = rng.uniform(0, 0.4, (world.cols, world.rows))
+    world.chemistry['C'][...] = 0
+    world.pool.energy[:world.pool.size] = rng.uniform(0, 2, world.pool.size)
+    rows, cx, cy, _, _ = world.plan_exchange(world.cells)
+    wander = (rng.random(len(rows)), rng.integers(0, 4, len(rows)))
+
+    moved, dx, dy, cost = world.plan_moves(rows, cx, cy, wander)
+
+    expected = {}
+    for i, cell in enumerate(world.cells):
+        action = cell._decide_movement(world.get_local_chemistry(cx[i], cy[i]),
+                                       world.get_neighbors_chemistry(cx[i], cy[i]),
+                                       wander=(wander[0][i], wander[1][i]))
+        if action:
+            expected[cell._row] = (action.dx, action.dy, action.cost)
+    assert expected
+    assert dict(zip(moved.tolist(), zip(dx.tolist(), dy.tolist(), cost.tolist()))) == expected
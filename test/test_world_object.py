@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from biology.cell import Cell
+from biology.gen import Gen
+from biology.genoma import Genoma
+from biology.world import World
+
+pygame = pytest.importorskip("pygame")
+world_object = pytest.importorskip("render.world_object")
+
+
+def test_draw_follows_steps_run_outside_update():
+    world = World(100, 60, cell_size=10, seed=0)
+    genoma = Genoma([Gen({'A': 1}, {}, cost=0.1, prob=1.0)])
+    for i in range(5):
+        world.add_cell(Cell(genoma), i, 1)
+    view = world_object.WorldObject(world)
+    screen = pygame.Surface((100, 160))
+
+    assert view.draw(screen) is None
+    assert len(view.draw(screen, partial=True)) == 1     # nothing changed: UI only
+
+    # Starving cells die, so the pool shrinks under the cached living rows
+    for cell in world.cells:
+        cell.energy = -1
+    world.step()
+    assert world.pool.size == 0
+
+    assert view.draw(screen, partial=True) is None
+    assert len(view._living) == 0
+    assert np.all(pygame.surfarray.array3d(screen)[:, :60] == view.bg_color)
+
+
+def test_draw_follows_seeding_between_steps():
+    world = World(100, 60, cell_size=10, seed=0)
+    view = world_object.WorldObject(world)
+    screen = pygame.Surface((100, 160))
+    view.draw(screen)
+    assert len(view.draw(screen, partial=True)) == 1
+
+    world.seed('A', 5.0)
+    assert view.draw(screen, partial=True) is None
+    assert not np.all(pygame.surfarray.array3d(screen)[:, :60] == view.bg_color)
+
+    world.chemistry['A'][...] = 0
+    world.touch()
+    assert view.draw(screen, partial=True) is None
+    assert np.all(pygame.surfarray.array3d(screen)[:, :60] == view.bg_color)